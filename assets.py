@@ -0,0 +1,123 @@
+"""Process-wide asset cache.
+
+Player sprites are loaded and scaled once per gender and then shared by
+every run. File names are matched case-insensitively, so the shipped
+`male_idle.PNG` is found when asked for `male_idle.png` on any platform.
+"""
+import os
+import threading
+
+import pygame
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+FONT_DIR = os.path.join(ASSET_DIR, "fonts")
+
+GENDER_PREFIX = {
+    "Male": "male",
+    "Female": "female",
+    "Other": "other"
+}
+
+def resolve(path):
+    """Return path, or the file in its directory whose name matches ignoring case."""
+    if os.path.exists(path):
+        return path
+    folder, name = os.path.split(path)
+    try:
+        for entry in os.listdir(folder or "."):
+            if entry.lower() == name.lower():
+                return os.path.join(folder, entry)
+    except OSError:
+        pass
+    return None
+
+def font_path(font_dir=FONT_DIR):
+    """First TTF/OTF bundled in font_dir, or None for pygame's own default font.
+
+    Both load straight from a file, so no system font lookup happens.
+    """
+    try:
+        names = sorted(os.listdir(font_dir))
+    except OSError:
+        return None
+    for name in names:
+        if name.lower().endswith((".ttf", ".otf")):
+            return os.path.join(font_dir, name)
+    return None
+
+def load_font(size, bold=False, path=None):
+    font = pygame.font.Font(path or font_path(), size)
+    font.set_bold(bold)
+    return font
+
+class AssetManager:
+    def __init__(self, asset_dir=ASSET_DIR, sprite_width=50):
+        self.asset_dir = asset_dir
+        self.sprite_width = sprite_width
+        self._raw = {}        # gender -> scaled, unconverted (idle, jump)
+        self._sprites = {}    # (gender, scale) -> display-ready (idle, jump)
+        self._masks = {}      # gender -> collision masks (idle, jump)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _load_scaled(self, prefix, pose):
+        path = resolve(os.path.join(self.asset_dir, "player", f"{prefix}_{pose}.png"))
+        if path is None:
+            return None
+        try:
+            img = pygame.image.load(path)
+        except pygame.error:
+            return None
+        # Scale to fixed width while maintaining aspect ratio
+        scale = self.sprite_width / img.get_width()
+        return pygame.transform.scale(img, (self.sprite_width, int(img.get_height() * scale)))
+
+    def _load_raw(self, gender):
+        with self._lock:
+            if gender not in self._raw:
+                prefix = GENDER_PREFIX.get(gender, "male")
+                pair = (self._load_scaled(prefix, "idle"), self._load_scaled(prefix, "jump"))
+                # Fallback to shapes unless both poses exist
+                self._raw[gender] = pair if None not in pair else (None, None)
+            return self._raw[gender]
+
+    def preload(self, genders=GENDER_PREFIX):
+        """Load and scale every gender variant now, and build its masks."""
+        for gender in genders:
+            self.player_masks(gender)
+
+    def preload_async(self, genders=GENDER_PREFIX):
+        """Preload on a daemon thread; player_sprites() waits if it gets there first."""
+        self._thread = threading.Thread(target=self.preload, args=(tuple(genders),),
+                                        daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def player_sprites(self, gender, scale=1.0):
+        """Shared (idle, jump) surfaces for gender, or (None, None) if missing.
+
+        scale shrinks them for a reduced-resolution world layer.
+        """
+        sprites = self._sprites.get((gender, scale))
+        if sprites is None:
+            sprites = self._load_raw(gender)
+            if None not in sprites and scale != 1:
+                sprites = tuple(pygame.transform.smoothscale(
+                    sprite, (round(sprite.get_width() * scale),
+                             round(sprite.get_height() * scale))) for sprite in sprites)
+            # convert_alpha needs the display, so it happens on the caller's thread
+            if None not in sprites and pygame.display.get_surface() is not None:
+                sprites = tuple(sprite.convert_alpha() for sprite in sprites)
+            self._sprites[gender, scale] = sprites
+        return sprites
+
+    def player_masks(self, gender):
+        """Collision masks for gender, or None if it falls back to shapes.
+
+        Built once from the scaled sprites; works without a display.
+        """
+        if gender not in self._masks:
+            sprites = self._load_raw(gender)
+            self._masks[gender] = None if None in sprites else \
+                tuple(pygame.mask.from_surface(sprite) for sprite in sprites)
+        return self._masks[gender]
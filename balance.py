@@ -0,0 +1,230 @@
+"""Monte Carlo balancing harness.
+
+Sweeps difficulty parameters and plays many seeded headless runs per
+configuration across all cores with a scripted, random or lookahead
+jumper (the bot.py autoplayer). Reports
+the survival-distance distribution and how often an obstacle spawns that
+no jump timing can clear.
+
+Usage:
+    python balance.py --runs 200000 --jumper scripted \\
+        --spawn-ticks 75 90 --gravity 1.0 1.1 --spike-chance 0.25 0.35
+    python balance.py --store arrays   # NumPy entity store (entity_store.py)
+
+"Unavoidable" is judged per obstacle, against the fixed jump arc. It
+ignores obstacles that are hard only because of their neighbours.
+"""
+import argparse
+import itertools
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import pygame
+
+from assets import AssetManager
+from bot import AutoPlayer, jump_arc
+from collision import pixel_overlap, shape_mask
+from entity_store import ArrayEntityManager
+from simulation import (WIDTH, GROUND_Y, DEFAULT_DIFFICULTY, Difficulty,
+                        EntityManager, World, step)
+
+BUCKET = 25  # distance histogram resolution
+
+# Entity stores a batch can run on; both play identical runs
+STORES = {"lists": EntityManager, "arrays": ArrayEntityManager}
+
+# ================= JUMPERS =================
+def random_jumper(rate=0.05):
+    def decide(world, rng):
+        return rng.random() < rate
+    return decide
+
+def scripted_jumper(lead_ticks=8):
+    """Jump when the next obstacle is lead_ticks away from the player."""
+    def decide(world, rng):
+        player = world.player.rect()
+        for obs in world.entities.live["obstacle"]:
+            if obs.x + obs.width > player.left:
+                return 0 <= obs.x - player.right <= lead_ticks * world.speed
+        return False
+    return decide
+
+def lookahead_jumper():
+    """The autoplayer from bot.py: plans each jump against the jump arc."""
+    return AutoPlayer()
+
+JUMPERS = {"random": random_jumper, "scripted": scripted_jumper,
+           "lookahead": lookahead_jumper}
+
+# ================= UNAVOIDABLE OBSTACLES =================
+_assets = None
+
+def _player_masks(gender):
+    global _assets
+    if _assets is None:
+        _assets = AssetManager()
+    return _assets.player_masks(gender)
+
+def _jump_arc(gender, jump_power, gravity):
+    """Hitbox and mask after each tick of a jump, up to landing."""
+    return jump_arc(gender, _player_masks(gender), jump_power, gravity)
+
+@lru_cache(maxsize=None)
+def clearable(obstacle_type, width, height, speed, gender, jump_power, gravity):
+    """True if some jump tick lets the player pass this obstacle untouched."""
+    ground, arc = _jump_arc(gender, jump_power, gravity)
+    mask = shape_mask(obstacle_type, width, height)
+    left, right = ground[0].left, ground[0].right
+
+    def obstacle_rect(t):
+        # Spawned at WIDTH, moved once in its first tick
+        return pygame.Rect(WIDTH - t * speed, GROUND_Y - height, width, height)
+
+    # Ticks where the obstacle overlaps the player's column
+    danger = [t for t in range(1, int((WIDTH + width) / speed) + 2)
+              if obstacle_rect(t).left < right and obstacle_rect(t).right > left]
+    for jump_tick in range(1, danger[-1] + 1):
+        for t in danger:
+            i = t - jump_tick
+            rect, player_mask = arc[i] if 0 <= i < len(arc) else ground
+            obs = obstacle_rect(t)
+            if rect.colliderect(obs) and pixel_overlap(rect, player_mask, obs, mask):
+                break
+        else:
+            return True
+    return False
+
+# ================= RUNS =================
+def run_batch(difficulty, jumper, seeds, max_ticks, gender, store="lists"):
+    """Play one batch of seeded runs; returns aggregate counters."""
+    masks = _player_masks(gender)
+    decide = JUMPERS[jumper]()
+    stats = {"runs": 0, "distance_sum": 0.0, "capped": 0,
+             "obstacles": 0, "unavoidable": 0, "histogram": Counter()}
+    jump = ("jump",)
+    for seed in seeds:
+        world = World(gender, masks, seed, difficulty=difficulty,
+                      entities=STORES[store]())
+        rng = random.Random(seed)
+        while not world.game_over and world.tick < max_ticks:
+            step(world, jump if decide(world, rng) else ())
+            obstacles = world.entities.live["obstacle"]
+            # A fresh spawn is the right-most obstacle, moved exactly once
+            if obstacles and obstacles[-1].prev_x == WIDTH:
+                obs = obstacles[-1]
+                stats["obstacles"] += 1
+                if not clearable(obs.type, obs.width, obs.height, obs.speed,
+                                 gender, difficulty.jump_power, difficulty.gravity):
+                    stats["unavoidable"] += 1
+        stats["runs"] += 1
+        stats["distance_sum"] += world.distance
+        stats["capped"] += not world.game_over
+        stats["histogram"][int(world.distance) // BUCKET] += 1
+    return stats
+
+def merge(total, part):
+    for key, value in part.items():
+        if key == "histogram":
+            total[key].update(value)
+        else:
+            total[key] += value
+
+def percentile(histogram, runs, q):
+    """Lower edge of the histogram bucket holding the q-th quantile."""
+    target = q * runs
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= target:
+            return bucket * BUCKET
+    return 0
+
+# ================= CLI =================
+def _number(text):
+    return int(text) if text.lstrip("-").isdigit() else float(text)
+
+def parse_steps(text):
+    """'300:10/150:7' -> ((300, 10), (150, 7)), highest distance first."""
+    steps = [tuple(_number(v) for v in part.split(":")) for part in text.split("/")]
+    return tuple(sorted(steps, reverse=True))
+
+def configurations(args):
+    sweep = {
+        "box_chance": args.box_chance,
+        "spike_chance": args.spike_chance,
+        "spawn_ticks": args.spawn_ticks,
+        "start_speed": args.start_speed,
+        "speed_steps": [parse_steps(s) for s in args.speed_steps],
+        "jump_power": args.jump_power,
+        "gravity": args.gravity,
+    }
+    for values in itertools.product(*sweep.values()):
+        yield Difficulty(**dict(zip(sweep, values)))
+
+def describe(difficulty):
+    changed = [f"{name}={value}" for name, value in difficulty._asdict().items()
+               if value != getattr(DEFAULT_DIFFICULTY, name)]
+    return ", ".join(changed) or "default"
+
+def main(argv=None):
+    d = DEFAULT_DIFFICULTY
+    parser = argparse.ArgumentParser(description="Sweep Chaser difficulty parameters.")
+    parser.add_argument("--runs", type=int, default=10000, help="runs per configuration")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch", type=int, default=500, help="runs per worker task")
+    parser.add_argument("--jumper", choices=sorted(JUMPERS), default="scripted")
+    parser.add_argument("--max-ticks", type=int, default=2 * 60 * 60,
+                        help="cap per run (default: two minutes of play)")
+    parser.add_argument("--seed", type=int, default=0, help="first run seed")
+    parser.add_argument("--gender", default="Male")
+    parser.add_argument("--store", choices=sorted(STORES), default="lists",
+                        help="entity store the runs simulate on")
+    parser.add_argument("--box-chance", type=float, nargs="+", default=[d.box_chance])
+    parser.add_argument("--spike-chance", type=float, nargs="+", default=[d.spike_chance])
+    parser.add_argument("--spawn-ticks", type=int, nargs="+", default=[d.spawn_ticks])
+    parser.add_argument("--start-speed", type=int, nargs="+", default=[d.start_speed])
+    parser.add_argument("--speed-steps", nargs="+", default=["300:10/150:7"],
+                        help="distance:speed pairs joined by '/'")
+    parser.add_argument("--jump-power", type=float, nargs="+", default=[d.jump_power])
+    parser.add_argument("--gravity", type=float, nargs="+", default=[d.gravity])
+    args = parser.parse_args(argv)
+
+    configs = list(configurations(args))
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Every configuration replays the same seeds, so differences come
+        # from the parameters rather than the luck of the draw
+        futures = []
+        for index, difficulty in enumerate(configs):
+            for first in range(args.seed, args.seed + args.runs, args.batch):
+                seeds = range(first, min(first + args.batch, args.seed + args.runs))
+                futures.append((index, pool.submit(run_batch, difficulty, args.jumper,
+                                                   seeds, args.max_ticks, args.gender,
+                                                   args.store)))
+
+        results = [{"runs": 0, "distance_sum": 0.0, "capped": 0,
+                    "obstacles": 0, "unavoidable": 0, "histogram": Counter()}
+                   for _ in configs]
+        for index, future in futures:
+            merge(results[index], future.result())
+    elapsed = time.perf_counter() - started
+
+    total_runs = sum(r["runs"] for r in results)
+    print(f"{total_runs} runs in {elapsed:.1f}s with {args.workers} workers "
+          f"({args.jumper} jumper, {args.store} store)")
+    print(f"{'mean':>7} {'p10':>6} {'p50':>6} {'p90':>6} {'capped':>7} "
+          f"{'unavoid':>8}  configuration")
+    for difficulty, r in zip(configs, results):
+        runs, hist = r["runs"], r["histogram"]
+        unavoidable = r["unavoidable"] / r["obstacles"] if r["obstacles"] else 0.0
+        print(f"{r['distance_sum'] / runs:7.1f} {percentile(hist, runs, 0.1):6d} "
+              f"{percentile(hist, runs, 0.5):6d} {percentile(hist, runs, 0.9):6d} "
+              f"{r['capped'] / runs:7.1%} {unavoidable:8.2%}  {describe(difficulty)}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
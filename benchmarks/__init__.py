@@ -0,0 +1,11 @@
+"""Headless benchmark suite for Chaser.
+
+Fixed-seed scenarios drive the simulation and the real renderer (with
+SDL's dummy video driver) and report ticks/sec, render ms/frame and
+tracemalloc peak memory. Results are written as JSON and can be checked
+against a stored baseline.
+
+Usage:
+    python -m benchmarks --out results.json
+    python -m benchmarks --baseline baseline.json --threshold 0.15
+"""
@@ -0,0 +1,61 @@
+import argparse
+import json
+import sys
+
+from .runner import comparable, compare, run_all
+from .scenarios import SCENARIOS, LOGIN_IDLE
+
+NAMES = (*SCENARIOS, LOGIN_IDLE)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Run the Chaser benchmark scenarios.")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"any of {', '.join(NAMES)} (default: all)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="fraction of each scenario's length to run (0.1 for a quick pass)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed passes per scenario; the fastest is kept")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="fail if any metric is this much worse than the baseline")
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(NAMES)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results = run_all(args.scenarios or NAMES, args.seed, args.scale, args.repeat)
+
+    print(f"\n{'scenario':<18} {'ticks/s':>10} {'render ms':>10} {'peak KiB':>10}")
+    for name, r in results["scenarios"].items():
+        tps = f"{r['ticks_per_sec']:.0f}" if r["ticks_per_sec"] else "-"
+        print(f"{name:<18} {tps:>10} {r['render_ms']:>10.3f} {r['peak_kb']:>10.0f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    problem = comparable(results, baseline)
+    if problem:
+        print(f"\nNot compared: {problem}")
+        return 2
+
+    print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+    regressions = 0
+    for name, metric, before, after, change, regressed in compare(results, baseline,
+                                                                  args.threshold):
+        regressions += regressed
+        print(f"{name:<18} {metric:<14} {before:>10.3f} -> {after:>10.3f} "
+              f"{change:+7.1%}{'  REGRESSION' if regressed else ''}")
+    print(f"{regressions} regression(s)" if regressions else "no regressions")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
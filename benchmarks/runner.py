@@ -0,0 +1,155 @@
+"""Measurement and baseline comparison for the benchmark scenarios."""
+import importlib.util
+import os
+import platform
+import random
+import time
+import tracemalloc
+
+import pygame
+
+from simulation import TICK_DT, step
+from .scenarios import SCENARIOS, LOGIN_IDLE, LOGIN_FRAMES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAME_PATH = os.path.join(ROOT, "updated game.py")
+
+SKY = (135, 206, 235)
+
+# metric -> +1 if bigger is better, -1 if smaller is better
+METRICS = {"ticks_per_sec": 1, "render_ms": -1, "peak_kb": -1}
+
+# Absolute differences below these are noise (cache warm-up from earlier
+# scenarios, timer resolution) and never count as regressions
+NOISE_FLOOR = {"render_ms": 0.05, "peak_kb": 64}
+
+# ================= GAME MODULE =================
+def load_game():
+    """Import the game script headless; it only runs its loop as __main__."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    spec = importlib.util.spec_from_file_location("chaser_game", GAME_PATH)
+    game = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(game)
+    game.finish_startup()
+    return game
+
+# ================= SCENARIOS =================
+def _play(game, scenario, seed, ticks):
+    """One pass over a scenario; returns (step seconds, render seconds, frames)."""
+    world = scenario.build(seed, game.assets.player_masks("Male"))
+    sprites = game.assets.player_sprites("Male")
+    rng = random.Random(seed)
+    jump = ("jump",)
+    clock = time.perf_counter
+    sim = render = 0.0
+    frames = 0
+    for t in range(ticks):
+        if scenario.before_tick:
+            scenario.before_tick(world)
+        inputs = jump if scenario.jumper(world, rng) else ()
+        started = clock()
+        step(world, inputs)
+        sim += clock() - started
+
+        if t % scenario.render_every == 0:
+            started = clock()
+            game.display.world.fill(SKY)
+            game.draw_world(world, sprites)
+            render += clock() - started
+            frames += 1
+    return sim, render, frames
+
+def _idle_login(game, frames):
+    game.state = "login"
+    game.dirty.invalidate()
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(frames):
+        # However long earlier scenarios took, attract mode must not kick in
+        game.last_input = time.time()
+        game.run_frame(TICK_DT, [])
+    return 0.0, clock() - started, frames
+
+def _peak_kb(run, *args):
+    tracemalloc.start()
+    try:
+        run(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def run_scenario(game, name, seed=1, scale=1.0, repeat=3):
+    """Measure one scenario.
+
+    The traced pass runs first, so peak memory includes filling the text
+    and sprite caches; timings are the best of `repeat` untraced passes.
+    """
+    if name == LOGIN_IDLE:
+        run, args = _idle_login, (game, max(1, int(LOGIN_FRAMES * scale)))
+        ticks = 0
+    else:
+        ticks = max(1, int(SCENARIOS[name].ticks * scale))
+        run, args = _play, (game, SCENARIOS[name], seed, ticks)
+
+    peak_kb = _peak_kb(run, *args)
+    passes = [run(*args) for _ in range(max(1, repeat))]
+    sim = min(p[0] for p in passes)
+    render = min(p[1] for p in passes)
+    frames = passes[0][2]
+    return {
+        "ticks": ticks,
+        "frames": frames,
+        "ticks_per_sec": round(ticks / sim, 1) if ticks else None,
+        "render_ms": round(render / frames * 1000, 4),
+        "peak_kb": round(peak_kb, 1),
+    }
+
+def run_all(names, seed=1, scale=1.0, repeat=3, report=print):
+    game = load_game()
+    results = {}
+    for name in names:
+        started = time.perf_counter()
+        results[name] = run_scenario(game, name, seed, scale, repeat)
+        report(f"{name:<18} done in {time.perf_counter() - started:.1f}s")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "seed": seed,
+            "scale": scale,
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "scenarios": results,
+    }
+
+# ================= BASELINE =================
+def compare(results, baseline, threshold):
+    """Rows of (scenario, metric, old, new, change, regressed).
+
+    change is relative, signed so that positive always means better.
+    """
+    rows = []
+    for name, new in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if old is None:
+            continue
+        for metric, sign in METRICS.items():
+            before, after = old.get(metric), new.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * sign
+            regressed = change < -threshold and \
+                abs(after - before) >= NOISE_FLOOR.get(metric, 0)
+            rows.append((name, metric, before, after, change, regressed))
+    return rows
+
+def comparable(results, baseline):
+    """Why the two result sets measure different work, or None."""
+    ours, theirs = results["meta"], baseline.get("meta", {})
+    for key in ("seed", "scale"):
+        if ours[key] != theirs.get(key):
+            return f"{key} differs from the baseline ({theirs.get(key)} vs {ours[key]})"
+    return None
@@ -0,0 +1,85 @@
+"""Fixed-seed stress scenarios.
+
+A scenario builds its World (difficulty, entity caps, pre-filled lanes)
+and may poke at it before every tick; inputs come from a jumper as in
+balance.py. The same seed always produces the same run, so two builds
+are measured on identical work.
+"""
+from collections import namedtuple
+from functools import partial
+
+from balance import scripted_jumper
+from bot import AutoPlayer
+from entity_store import ArrayEntityManager
+from simulation import (WIDTH, DEFAULT_DIFFICULTY, ENTITY_CAPS, TICK_RATE,
+                        Cloud, EntityManager, World, generate_level)
+
+Scenario = namedtuple("Scenario", "name ticks render_every build before_tick jumper")
+
+CLOUD_CROWD = 1000
+
+def _never_jump(world, rng):
+    return False
+
+def _endless(world):
+    """No game over: the scenario always runs its full length."""
+    world.lives = 10 ** 9
+
+# ================= LONG RUN =================
+def build_long_run(seed, masks):
+    difficulty = DEFAULT_DIFFICULTY._replace(start_speed=10, speed_steps=())
+    world = World("Male", masks, seed, difficulty=difficulty)
+    _endless(world)
+    return world
+
+# ================= SPIKE STORM =================
+def build_spike_storm(seed, masks):
+    difficulty = DEFAULT_DIFFICULTY._replace(box_chance=0.0, spike_chance=1.0,
+                                             spawn_ticks=15)
+    # Spawns closer than a jump are the point here, so no fairness gaps
+    world = World("Male", masks, seed, difficulty=difficulty,
+                  level=partial(generate_level, fair=False))
+    _endless(world)
+    return world
+
+def spike_storm_tick(world):
+    # Every spike lands a hit and drops its diamonds
+    world.player.invincible = False
+
+# ================= CLOUD CROWD =================
+def cloud_crowd(store):
+    """Builder for a screen full of clouds held in `store`."""
+    def build(seed, masks):
+        caps = dict(ENTITY_CAPS, cloud=CLOUD_CROWD + 24)
+        world = World("Male", masks, seed, entities=store(caps))
+        _endless(world)
+        entities = world.entities
+        for n in range(CLOUD_CROWD):
+            cloud = Cloud(world.speed, world.cloud_rng)
+            cloud.x = cloud.prev_x = -100 + n * (WIDTH + 150) / CLOUD_CROWD
+            entities.spawn("cloud", cloud)
+        entities.advance("cloud")  # sorts the lane
+        return world
+    return build
+
+def cloud_crowd_tick(world):
+    entities = world.entities
+    while entities.count("cloud") < CLOUD_CROWD:
+        entities.create("cloud", world.speed, world.cloud_rng)
+
+# ================= REGISTRY =================
+SCENARIOS = {s.name: s for s in (
+    Scenario("long_run_speed10", 10 * 60 * TICK_RATE, 4, build_long_run, None,
+             AutoPlayer()),
+    Scenario("spike_storm", 60 * TICK_RATE, 1, build_spike_storm, spike_storm_tick,
+             _never_jump),
+    Scenario("cloud_crowd", 30 * TICK_RATE, 4, cloud_crowd(EntityManager),
+             cloud_crowd_tick, scripted_jumper()),
+    # The same run on the NumPy store (entity_store.py)
+    Scenario("cloud_crowd_arrays", 30 * TICK_RATE, 4, cloud_crowd(ArrayEntityManager),
+             cloud_crowd_tick, scripted_jumper()),
+)}
+
+# The login screen has no simulation; it is measured in idle frames
+LOGIN_IDLE = "login_idle"
+LOGIN_FRAMES = 10 * TICK_RATE
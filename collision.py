@@ -0,0 +1,61 @@
+"""Collision detection along the scrolling lane.
+
+Broad phase: entity lists are kept sorted by x, so a query only looks at
+the slice of entities whose left edge could reach the query rect, tested
+in one Rect.collidelistall call against their persistent hitboxes.
+
+Narrow phase: rect hits are confirmed with pygame.mask overlap. Masks are
+built once per sprite and per obstacle shape/size, never in the frame loop.
+"""
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from operator import attrgetter
+
+import pygame
+
+from sprite_cache import BUILDERS
+
+_left = attrgetter("x")
+
+def sort_lane(items):
+    """Restore x order in place; nearly-sorted input makes this linear."""
+    items.sort(key=_left)
+
+def nearby(items, rect, max_width):
+    """Entities (sorted by x, at most max_width wide) that may overlap rect."""
+    lo = bisect_left(items, rect.left - max_width, key=_left)
+    hi = bisect_right(items, rect.right, key=_left, lo=lo)
+    return items[lo:hi]
+
+def collide(items, rect, max_width, mask=None):
+    """Entities whose hitbox overlaps rect, in x order.
+
+    With a mask (aligned to rect's top-left), rect hits are only kept when
+    the entity's own mask overlaps it pixel for pixel.
+    """
+    candidates = nearby(items, rect, max_width)
+    if not candidates:
+        return candidates
+    hits = [candidates[i] for i in rect.collidelistall([e.hitbox for e in candidates])]
+    if mask is None:
+        return hits
+    return [e for e in hits if pixel_overlap(rect, mask, e.hitbox, e.mask)]
+
+# ================= MASKS =================
+def pixel_overlap(rect_a, mask_a, rect_b, mask_b):
+    offset = (rect_b.x - rect_a.x, rect_b.y - rect_a.y)
+    return mask_a.overlap(mask_b, offset) is not None
+
+@lru_cache(maxsize=None)
+def shape_mask(kind, *dims):
+    """Mask of a procedurally drawn shape, aligned to its hitbox top-left."""
+    surf, _ = BUILDERS[kind](*dims)
+    return pygame.mask.from_surface(surf)
+
+@lru_cache(maxsize=None)
+def fallback_player_mask():
+    """Head, body and legs of the shape-drawn player, in its 20x70 hitbox."""
+    mask = pygame.mask.Mask((20, 70))
+    for part in ((0, 0, 20, 20), (5, 20, 10, 30), (0, 50, 8, 20), (12, 50, 8, 20)):
+        mask.draw(pygame.mask.Mask(part[2:], fill=True), part[:2])
+    return mask
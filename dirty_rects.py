@@ -0,0 +1,65 @@
+"""Dirty-rectangle presentation.
+
+The frame is still composed on one surface, but only the regions that
+changed are pushed to the screen (pygame.display.update(rects), or
+display.Display.present).
+"""
+import pygame
+
+# Past this many regions one bounding rect is cheaper than many small copies
+MAX_RECTS = 48
+
+class DirtyRects:
+    def __init__(self):
+        self.rects = []
+        self.full = True
+        self._keys = {}
+        self._areas = {}
+        self._moving = {}
+
+    def invalidate(self):
+        """Next present() pushes the whole window."""
+        self.full = True
+
+    def add(self, rect):
+        self.rects.append(pygame.Rect(rect))
+
+    def changed(self, name, key):
+        """True when a watched value differs from the previous frame."""
+        if self._keys.get(name, self) == key:
+            return False
+        self._keys[name] = key
+        return True
+
+    def watch(self, name, key, area):
+        """Dirty a widget's old and new area when its visible state changes.
+
+        Returns the areas dirtied (none if nothing changed), for the caller
+        to repaint.
+        """
+        if not self.changed(name, key):
+            return []
+        areas = [pygame.Rect(area)]
+        old = self._areas.get(name)
+        if old is not None:
+            areas.insert(0, old)
+        self.rects.extend(areas)
+        self._areas[name] = pygame.Rect(area)
+        return areas
+
+    def track(self, name, rects):
+        """Dirty where moving things were last frame and where they are now."""
+        self.rects.extend(self._moving.get(name, ()))
+        self.rects.extend(rects)
+        self._moving[name] = rects
+
+    def present(self, update=pygame.display.update):
+        """Push the dirty regions; update() with no argument means everything."""
+        if self.full:
+            update()
+        elif len(self.rects) > MAX_RECTS:
+            update([self.rects[0].unionall(self.rects[1:])])
+        elif self.rects:
+            update(self.rects)
+        self.rects = []
+        self.full = False
@@ -0,0 +1,124 @@
+"""Window management and the logical render target.
+
+Everything draws into `surface`, an offscreen canvas at the game's
+logical size, in logical coordinates. present() copies it to the window
+once per frame: region by region when the window has the same size, or
+scaled into a letterboxed viewport after a resize or in fullscreen.
+
+The play field may instead be drawn into `world`, a smaller layer at
+`render_scale` of the logical size that present_world() stretches onto
+the canvas. At 0.5 that fills a quarter of the pixels, and the HUD drawn
+on the canvas afterwards stays sharp.
+
+With gpu=True the window is opened with pygame.SCALED. SDL then keeps
+the window surface at the logical size and scales it through its GPU
+renderer (an SDL_Renderer streaming into a texture), so resizing and
+fullscreen cost no CPU scaling.
+"""
+import pygame
+
+BORDER = (0, 0, 0)
+
+class Display:
+    def __init__(self, size, render_scale=1.0, window_size=None, fullscreen=False,
+                 gpu=False, smooth=False, caption=None):
+        self.size = tuple(size)
+        self.gpu = gpu
+        self.smooth = smooth
+        self.fullscreen = fullscreen
+        self.window_size = tuple(window_size or size)
+        if caption:
+            pygame.display.set_caption(caption)
+        self._open()
+        # The canvas outlives window changes, so callers can hold on to it
+        self.surface = pygame.Surface(self.size).convert()
+        self.set_render_scale(render_scale)
+
+    # ---------------- window ----------------
+    def _open(self):
+        if self.gpu:
+            flags = pygame.SCALED | pygame.RESIZABLE
+            if self.fullscreen:
+                flags |= pygame.FULLSCREEN
+            self.window = pygame.display.set_mode(self.size, flags)
+        elif self.fullscreen:
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.window = pygame.display.set_mode(self.window_size, pygame.RESIZABLE)
+        self._fit()
+
+    def _fit(self):
+        """Largest viewport with the logical aspect ratio, centred."""
+        width, height = self.window.get_size()
+        k = min(width / self.size[0], height / self.size[1])
+        self.viewport = pygame.Rect(0, 0, int(self.size[0] * k), int(self.size[1] * k))
+        self.viewport.center = (width // 2, height // 2)
+        self.scaled = self.viewport.size != self.size
+        self._target = self.window.subsurface(self.viewport) if self.scaled else None
+        self.window.fill(BORDER)
+
+    def handle_event(self, event):
+        """Follow window resizes; True if the next present must be full."""
+        if event.type == pygame.VIDEORESIZE and not (self.gpu or self.fullscreen):
+            self.window_size = event.size
+            self._open()
+            return True
+        return event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWSIZECHANGED)
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if self.gpu:
+            pygame.display.toggle_fullscreen()
+        else:
+            self._open()
+
+    # ---------------- coordinates ----------------
+    def to_logical(self, pos):
+        """Window pixel -> canvas pixel."""
+        if not self.scaled:
+            return pos
+        return ((pos[0] - self.viewport.x) * self.size[0] // self.viewport.width,
+                (pos[1] - self.viewport.y) * self.size[1] // self.viewport.height)
+
+    def mouse_pos(self):
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def translate(self, event):
+        """The event with any mouse position mapped onto the canvas."""
+        if self.scaled and hasattr(event, "pos"):
+            return pygame.event.Event(event.type, event.dict, pos=self.to_logical(event.pos))
+        return event
+
+    # ---------------- render scale ----------------
+    def set_render_scale(self, scale):
+        self.render_scale = scale
+        if scale == 1:
+            self.world = self.surface
+        else:
+            size = (round(self.size[0] * scale), round(self.size[1] * scale))
+            self.world = pygame.Surface(size).convert()
+
+    def present_world(self):
+        """Stretch the world layer over the whole canvas (no-op at scale 1)."""
+        if self.world is not self.surface:
+            self._scale(self.world, self.size, self.surface)
+
+    # ---------------- presenting ----------------
+    def _scale(self, source, size, dest):
+        if self.smooth:
+            pygame.transform.smoothscale(source, size, dest)
+        else:
+            pygame.transform.scale(source, size, dest)
+
+    def present(self, rects=None):
+        """Show the canvas; rects limits the copy when nothing is scaled."""
+        if self.scaled:
+            self._scale(self.surface, self.viewport.size, self._target)
+            pygame.display.flip()
+        elif rects is None:
+            self.window.blit(self.surface, (0, 0))
+            pygame.display.flip()
+        else:
+            for rect in rects:
+                self.window.blit(self.surface, rect, rect)
+            pygame.display.update(rects)
@@ -0,0 +1,279 @@
+"""NumPy struct-of-arrays entity store for headless and stress runs.
+
+ArrayEntityManager has the same interface as simulation.EntityManager,
+but keeps x/y/size/type/alive per kind in parallel arrays. Movement,
+culling and the AABB test against the player are each one vectorized op
+per tick. Only rect hits become Python objects (EntityView), for the
+pixel-mask narrow phase and the game rules in step(). `live` builds views
+of every live row on access, for the bot, the jumpers and the renderer;
+it is the slow path here, so read it once per tick.
+
+The window renderer still uses the list store; this one is for World(...,
+entities=ArrayEntityManager()) in batch simulation (balance.py --store
+arrays, benchmark cloud_crowd_arrays). Per-tick numpy overhead makes it
+slower than the lists at game-sized counts; it wins from a few hundred
+entities per kind up.
+
+Usage:
+    python entity_store.py [entities_per_kind] [ticks]
+"""
+import sys
+import time
+from collections.abc import Mapping
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for this store
+    np = None
+
+from collision import pixel_overlap
+from simulation import ENTITY_CAPS, ENTITY_CLASSES, Pool, World, step
+
+# Entity attributes copied into the arrays on spawn
+TYPE_NAMES = ["box", "spike", "tall", "diamond", "cloud"]
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+# Clouds drift slower than the lane they spawn in (see Cloud.update)
+SPEED_SCALE = {"cloud": 0.3}
+
+# ================= LANE =================
+class _Lane:
+    """Fixed-capacity arrays for one entity kind."""
+    def __init__(self, capacity, speed_scale=1.0):
+        self.speed_scale = speed_scale
+        self.x = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.despawn_x = np.zeros(capacity)
+        # Hitbox relative to (x, y): left offset is always 0
+        self.hit_top = np.zeros(capacity, dtype=np.int64)
+        self.hit_w = np.zeros(capacity, dtype=np.int64)
+        self.hit_h = np.zeros(capacity, dtype=np.int64)
+        self.width = np.zeros(capacity, dtype=np.int64)
+        self.height = np.zeros(capacity, dtype=np.int64)
+        self.type = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.hit = np.zeros(capacity, dtype=bool)
+        self.masks = [None] * capacity
+        self.count = 0
+
+    def add(self, entity):
+        free = np.flatnonzero(~self.alive)
+        if not len(free):
+            # Full: drop the left-most, like EntityManager does
+            self.kill(int(np.argmin(np.where(self.alive, self.x, np.inf))))
+            free = np.flatnonzero(~self.alive)
+        i = int(free[0])
+
+        self.x[i] = self.prev_x[i] = entity.x
+        self.y[i] = entity.y
+        self.speed[i] = entity.speed * self.speed_scale
+        self.despawn_x[i] = entity.despawn_x
+        hitbox = getattr(entity, "hitbox", None)
+        if hitbox is not None:
+            self.hit_top[i] = hitbox.top - int(entity.y)
+            self.hit_w[i], self.hit_h[i] = hitbox.size
+        else:
+            self.hit_w[i] = self.hit_h[i] = 0
+        self.width[i] = getattr(entity, "width", 0)
+        self.height[i] = getattr(entity, "height", 0)
+        self.type[i] = TYPE_CODES[getattr(entity, "type", None) or type(entity).__name__.lower()]
+        self.hit[i] = getattr(entity, "hit", False)
+        self.masks[i] = getattr(entity, "mask", None)
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.masks[i] = None
+            self.count -= 1
+
+# ================= VIEW =================
+class EntityView:
+    """Attribute access to one row, shaped like an Obstacle or Diamond."""
+    __slots__ = ("lane", "i")
+
+    def __init__(self, lane, i):
+        self.lane = lane
+        self.i = i
+
+    @property
+    def x(self):
+        return self.lane.x[self.i]
+
+    @property
+    def prev_x(self):
+        return self.lane.prev_x[self.i]
+
+    @property
+    def y(self):
+        return self.lane.y[self.i]
+
+    @property
+    def speed(self):
+        """The speed the entity was spawned with (before SPEED_SCALE)."""
+        speed = float(self.lane.speed[self.i] / self.lane.speed_scale)
+        return int(speed) if speed.is_integer() else speed
+
+    @property
+    def width(self):
+        return int(self.lane.width[self.i])
+
+    @property
+    def height(self):
+        return int(self.lane.height[self.i])
+
+    @property
+    def type(self):
+        return TYPE_NAMES[self.lane.type[self.i]]
+
+    @property
+    def hit(self):
+        return bool(self.lane.hit[self.i])
+
+    @hit.setter
+    def hit(self, value):
+        self.lane.hit[self.i] = value
+
+    @property
+    def hitbox(self):
+        lane, i = self.lane, self.i
+        return pygame.Rect(int(lane.x[i]), int(lane.y[i]) + lane.hit_top[i],
+                           lane.hit_w[i], lane.hit_h[i])
+
+    @property
+    def mask(self):
+        return self.lane.masks[self.i]
+
+    def move_to(self, x, y):
+        lane, i = self.lane, self.i
+        lane.x[i] = lane.prev_x[i] = x
+        lane.y[i] = y
+
+# ================= MANAGER =================
+class _LiveViews(Mapping):
+    """kind -> EntityViews of the live rows, sorted by x like EntityManager.live."""
+    def __init__(self, lanes):
+        self.lanes = lanes
+
+    def __getitem__(self, kind):
+        lane = self.lanes[kind]
+        rows = np.flatnonzero(lane.alive)
+        rows = rows[np.argsort(lane.x[rows], kind="stable")]
+        return [EntityView(lane, int(i)) for i in rows]
+
+    def __iter__(self):
+        return iter(self.lanes)
+
+    def __len__(self):
+        return len(self.lanes)
+
+class ArrayEntityManager:
+    def __init__(self, caps=ENTITY_CAPS):
+        if np is None:
+            raise RuntimeError("ArrayEntityManager needs numpy (pip install numpy)")
+        self.caps = dict(caps)
+        self.lanes = {kind: _Lane(cap, SPEED_SCALE.get(kind, 1.0))
+                      for kind, cap in self.caps.items()}
+        self.peak = {kind: 0 for kind in self.caps}
+        # Entity objects only carry spawn parameters into the arrays,
+        # so one pooled instance per kind is reused for every spawn
+        self.pools = {kind: Pool(ENTITY_CLASSES[kind]) for kind in self.caps}
+
+    @property
+    def live(self):
+        return _LiveViews(self.lanes)
+
+    def create(self, kind, *args, **kwargs):
+        pool = self.pools[kind]
+        entity = pool.acquire(*args, **kwargs)
+        view = self.spawn(kind, entity)
+        pool.release(entity)
+        return view
+
+    def spawn(self, kind, entity):
+        """Copy entity into the arrays; returns a view of its row."""
+        lane = self.lanes[kind]
+        i = lane.add(entity)
+        if lane.count > self.peak[kind]:
+            self.peak[kind] = lane.count
+        return EntityView(lane, i)
+
+    def remove(self, kind, view):
+        self.lanes[kind].kill(view.i)
+
+    def advance(self, kind):
+        lane = self.lanes[kind]
+        lane.prev_x[:] = lane.x
+        lane.x -= lane.speed
+
+    def hits(self, kind, rect, mask=None):
+        lane = self.lanes[kind]
+        left = lane.x.astype(np.int64)
+        top = lane.y.astype(np.int64) + lane.hit_top
+        # Same test as Rect.colliderect, for every row at once
+        overlap = (lane.alive & (lane.hit_w > 0) & (lane.hit_h > 0) &
+                   (left < rect.right) & (left + lane.hit_w > rect.left) &
+                   (top < rect.bottom) & (top + lane.hit_h > rect.top))
+        rows = np.flatnonzero(overlap)
+        if not len(rows):
+            return []
+        views = [EntityView(lane, int(i)) for i in rows[np.argsort(lane.x[rows], kind="stable")]]
+        if mask is None:
+            return views
+        return [v for v in views if pixel_overlap(rect, mask, v.hitbox, v.mask)]
+
+    def cull(self):
+        for lane in self.lanes.values():
+            dead = lane.alive & (lane.x < lane.despawn_x)
+            if dead.any():
+                lane.alive &= ~dead
+                lane.count -= int(dead.sum())
+                for i in np.flatnonzero(dead):
+                    lane.masks[i] = None
+
+    def count(self, kind):
+        return self.lanes[kind].count
+
+    def clear(self):
+        for lane in self.lanes.values():
+            lane.alive[:] = False
+            lane.masks = [None] * len(lane.masks)
+            lane.count = 0
+
+# ================= STRESS RUN =================
+def _stress(entities, per_kind, ticks, seed=1):
+    """Pre-fill a lane far wider than the screen and run a jumping player."""
+    from simulation import Obstacle, Diamond, Cloud
+    world = World(seed=seed, entities=entities)
+    rng = world.rng
+    for n in range(per_kind):
+        for kind, cls in (("obstacle", Obstacle), ("diamond", Diamond), ("cloud", Cloud)):
+            if cls is Obstacle:
+                entity = cls(1, rng.choice(("box", "spike", "tall")), rng=rng)
+            else:
+                entity = cls(1, rng)
+            entity.x = entity.prev_x = 200 + n * 7
+            if hasattr(entity, "hitbox"):
+                entity.hitbox.x = entity.x
+            entities.spawn(kind, entity)
+    world.lives = 10 ** 9
+    started = time.perf_counter()
+    for t in range(ticks):
+        step(world, ("jump",) if t % 45 == 0 else ())
+    return ticks / (time.perf_counter() - started), world
+
+if __name__ == "__main__":
+    from simulation import EntityManager
+    per_kind = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    caps = {kind: per_kind + 64 for kind in ENTITY_CAPS}
+    for name, store in (("lists", EntityManager(caps)), ("arrays", ArrayEntityManager(caps))):
+        rate, world = _stress(store, per_kind, ticks)
+        print(f"{name:>6}: {rate:8.0f} ticks/s  lives lost {10 ** 9 - world.lives}, "
+              f"diamonds {world.diamonds_collected}")
@@ -0,0 +1,153 @@
+"""Ghost racing: a run's per-tick trace, and a Player that follows one.
+
+File layout (little endian, fixed width so tick n is at a known offset):
+    header  b"CHGT", version u8, seed u32, gender u8
+    record  player y f32, on_ground u8, distance f32; one per tick from 0
+
+TraceRecorder appends a record after every step() through a large write
+buffer, so recording costs no system call per tick. GhostTrace maps the
+file with mmap and unpacks records straight from the mapping: opening an
+hour-long trace reads nothing, and only the pages around the ticks being
+played become resident.
+
+Usage:
+    python ghost.py ghosts/alice.trace
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from assets import GENDER_PREFIX
+from simulation import PLAYER_X, Player
+
+MAGIC = b"CHGT"
+VERSION = 1
+HEADER = struct.Struct("<4sBIB")
+RECORD = struct.Struct("<fBf")
+GENDERS = tuple(GENDER_PREFIX)
+
+GHOST_DIR = "ghosts"
+BUFFER_BYTES = 1 << 16
+GHOST_ALPHA = 110
+# step() scrolls speed pixels per tick and adds speed * 0.05 to distance
+PIXELS_PER_DISTANCE = 20
+
+def trace_path(username):
+    """Where the best run of username is kept."""
+    name = "".join(c if c.isalnum() or c in "-_" else "_" for c in username)
+    return os.path.join(GHOST_DIR, f"{name or 'player'}.trace")
+
+# ================= RECORDING =================
+class TraceRecorder:
+    """Call record() after every step(); finish() when the run is over."""
+    def __init__(self, path, world):
+        self.path = path
+        self.world = world
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "wb", buffering=BUFFER_BYTES)
+        self._file.write(HEADER.pack(MAGIC, VERSION, world.seed,
+                                     GENDERS.index(world.player.gender)))
+        self.record()  # tick 0, so record n is tick n
+
+    def record(self):
+        player = self.world.player
+        self._file.write(RECORD.pack(player.y, player.on_ground, self.world.distance))
+
+    def finish(self, keep_as=None):
+        """Close the trace and move it to keep_as, or delete it if None."""
+        self._file.close()
+        if keep_as:
+            os.replace(self.path, keep_as)
+        else:
+            os.remove(self.path)
+
+# ================= PLAYBACK =================
+class GhostTrace:
+    """Read-only view of a trace file; trace[tick] is (y, on_ground, distance)."""
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.seed, gender = HEADER.unpack_from(self._map)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise ValueError(f"{path} is not a Chaser ghost trace")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a Chaser ghost trace (or unsupported version)")
+        self.gender = GENDERS[gender]
+        self.ticks = (len(self._map) - HEADER.size) // RECORD.size
+
+    def __len__(self):
+        return self.ticks
+
+    def __getitem__(self, tick):
+        if not 0 <= tick < self.ticks:
+            raise IndexError(tick)
+        return RECORD.unpack_from(self._map, HEADER.size + tick * RECORD.size)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+class Ghost:
+    """Poses a Player from a trace, so it draws exactly like the player."""
+    def __init__(self, trace, masks=None):
+        self.trace = trace
+        self.gender = trace.gender
+        self.player = Player(trace.gender, masks)
+        self.best = trace[len(trace) - 1][2]
+        self.finished = False
+
+    @classmethod
+    def open(cls, path, masks_for=None):
+        """The ghost stored at path, or None if there is none (or it is unreadable)."""
+        try:
+            trace = GhostTrace(path)
+        except (OSError, ValueError):
+            return None
+        if not len(trace):
+            trace.close()
+            return None
+        return cls(trace, masks_for(trace.gender) if masks_for else None)
+
+    def follow(self, world):
+        """Move to the trace's state at world.tick; call after each step()."""
+        if world.tick >= len(self.trace):
+            self.finished = True
+            return
+        y, on_ground, distance = self.trace[world.tick]
+        self.player.x = PLAYER_X + (distance - world.distance) * PIXELS_PER_DISTANCE
+        self.player.pose(y, bool(on_ground))
+
+    def close(self):
+        self.trace.close()
+
+def translucent(sprites, alpha=GHOST_ALPHA):
+    """Faded copies of (idle, jump) player sprites."""
+    faded = []
+    for sprite in sprites:
+        if sprite is not None:
+            sprite = sprite.copy()
+            sprite.set_alpha(alpha)
+        faded.append(sprite)
+    return tuple(faded)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Describe a Chaser ghost trace.")
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    trace = GhostTrace(args.path)
+    ticks = len(trace)
+    jumps = sum(1 for t in range(1, ticks) if trace[t - 1][1] and not trace[t][1])
+    print(f"seed {trace.seed}, {trace.gender}: {ticks} ticks, "
+          f"distance {int(trace[ticks - 1][2]) if ticks else 0}, {jumps} jumps, "
+          f"{os.path.getsize(args.path)} bytes")
+    trace.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Frame pacing with late input sampling, and keypress latency probes.
+
+clock.tick() sleeps blindly and leaves input in the queue until the next
+frame starts. InputSampler waits out the frame in pygame.event.wait()
+instead. Each event is stamped with perf_counter() as soon as it arrives,
+and collect() drains whatever is left right before the frame simulates.
+It can also narrow the queue with pygame.event.set_allowed(), so events
+nobody reads are dropped by SDL rather than converted and discarded.
+
+LatencyProbe follows jump presses from their arrival stamp to the first
+present() after the tick that applied them.
+"""
+import time
+from collections import deque
+
+import pygame
+
+# Always allowed when filtering: quitting, hotkeys and window changes
+BASE_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.VIDEORESIZE,
+               pygame.VIDEOEXPOSE, pygame.WINDOWSIZECHANGED)
+
+class InputSampler:
+    def __init__(self, fps, filter_events=False):
+        self.frame_dt = 1 / fps
+        self.filter_events = filter_events
+        self.frame_start = time.perf_counter()
+        self.events = []
+        self._allowed = None
+
+    def allow(self, types):
+        """Let only BASE_EVENTS and `types` into the queue (if filtering)."""
+        types = frozenset(BASE_EVENTS + tuple(types))
+        if self.filter_events and types != self._allowed:
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(list(types))
+            self._allowed = types
+
+    def _stamp(self, event):
+        if event.type != pygame.NOEVENT:
+            event.stamp = time.perf_counter()
+            self.events.append(event)
+
+    def wait_frame(self):
+        """Sleep until the next frame is due, stamping events as they arrive.
+
+        Returns the time since the previous frame started, like clock.tick().
+        """
+        deadline = self.frame_start + self.frame_dt
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining < 0.001:
+                break
+            self._stamp(pygame.event.wait(int(remaining * 1000)))
+        now = time.perf_counter()
+        dt = now - self.frame_start
+        self.frame_start = now
+        return dt
+
+    def wait_idle(self, timeout):
+        """Block until input arrives or `timeout` seconds pass.
+
+        For screens with nothing animating. Input still starts at most one
+        frame per frame_dt, so a flood of mouse motion cannot spin the loop.
+        """
+        if not self.events:
+            self._stamp(pygame.event.wait(int(timeout * 1000)))
+        return self.wait_frame()
+
+    def collect(self):
+        """Everything received since the last call, oldest first."""
+        for event in pygame.event.get():
+            self._stamp(event)
+        events, self.events = self.events, []
+        return events
+
+class LatencyProbe:
+    """Keypress-to-present times of the last `capacity` jumps, in ms."""
+    def __init__(self, capacity=600):
+        self.samples = deque(maxlen=capacity)
+        self.waiting = []   # pressed, no tick has run since
+        self.applied = []   # simulated, not yet on screen
+
+    def press(self, stamp):
+        self.waiting.append(stamp)
+
+    def simulated(self):
+        """Call after a tick ran; presses so far are now in the world."""
+        if self.waiting:
+            self.applied += self.waiting
+            self.waiting = []
+
+    def presented(self):
+        """Call right after the frame reached the screen."""
+        if self.applied:
+            now = time.perf_counter()
+            self.samples.extend((now - stamp) * 1000 for stamp in self.applied)
+            self.applied = []
+
+    def summary(self):
+        if not self.samples:
+            return "input latency: no jumps yet"
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        return (f"input latency n={n} mean {sum(ordered) / n:.1f}ms "
+                f"p50 {ordered[n // 2]:.1f}ms p99 {ordered[min(n - 1, int(n * 0.99))]:.1f}ms "
+                f"max {ordered[-1]:.1f}ms")
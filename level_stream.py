@@ -0,0 +1,78 @@
+"""Level schedule generated ahead of play on a worker thread.
+
+simulation.generate_level() walks the speed schedule tick by tick to check
+its fairness rules. LevelStream runs it on a daemon thread that keeps a
+bounded queue up to `depth` chunks ahead of the player, so step() only
+pops a ready-made entry. The chunks are exactly the ones the generator
+yields inline, so replays simulated without the thread match the live run.
+
+Usage:
+    python level_stream.py --seed 7 --chunks 20
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+
+from simulation import DEFAULT_DIFFICULTY, generate_level
+
+class LevelStream:
+    """Iterator of Chunks; pass the class itself as World(level=...)."""
+    def __init__(self, seed, difficulty=DEFAULT_DIFFICULTY, depth=64):
+        self._queue = queue.Queue(maxsize=depth)
+        self._closed = threading.Event()
+        self.stalls = 0  # pops that had to wait for the worker
+        self._thread = threading.Thread(target=self._fill,
+                                        args=(generate_level(seed, difficulty),),
+                                        daemon=True)
+        self._thread.start()
+
+    def _fill(self, chunks):
+        for chunk in chunks:
+            if self._closed.is_set():
+                return
+            # Sleeps while the queue is full; close() makes room to wake it
+            self._queue.put(chunk)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            self.stalls += 1
+            return self._queue.get()
+
+    def close(self):
+        """Stop the worker; call when the world is thrown away."""
+        self._closed.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a run's level schedule.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunks", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    stream = LevelStream(args.seed)
+    time.sleep(0.05)  # let the worker get ahead, as it does during play
+    started = time.perf_counter()
+    chunks = [next(stream) for _ in range(args.chunks)]
+    elapsed = time.perf_counter() - started
+    stream.close()
+
+    for n, chunk in enumerate(chunks):
+        obstacle = f"{chunk.type} {chunk.height}" if chunk.type else "gap"
+        diamond = f"diamond at {chunk.diamond_y}" if chunk.diamond_y is not None else ""
+        print(f"{n:>4}: {obstacle:<10} {diamond}")
+    print(f"{args.chunks} chunks popped in {elapsed * 1e6:.0f} us, {stream.stalls} stalls")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
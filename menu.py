@@ -0,0 +1,40 @@
+"""Retained-mode menu screens.
+
+A Menu is a static backdrop (titles, result text) plus widgets that know
+their view_key() and area(). A full repaint only happens when the dirty
+tracker asks for one (new screen, new sky colour). Otherwise only widgets
+whose view_key() changed are repainted: their old and new areas are
+cleared to the background, the backdrop is redrawn clipped to them, and
+every widget touching them is drawn again in order. An idle screen draws
+nothing at all.
+"""
+
+class Menu:
+    def __init__(self, surface, widgets, backdrop=None):
+        self.surface = surface
+        self.widgets = widgets      # name -> widget, in drawing order
+        self.backdrop = backdrop    # callable drawing the static parts
+
+    def redraw(self, background, dirty):
+        """Repaint whatever changed; `dirty` (a DirtyRects) tracks the widgets."""
+        areas = []
+        for name, widget in self.widgets.items():
+            areas += dirty.watch(name, widget.view_key(), widget.area())
+        surface = self.surface
+        if dirty.full:
+            surface.fill(background)
+            if self.backdrop:
+                self.backdrop()
+            for widget in self.widgets.values():
+                widget.draw()
+            return
+
+        for area in areas:
+            surface.set_clip(area)
+            surface.fill(background, area)
+            if self.backdrop:
+                self.backdrop()
+            for widget in self.widgets.values():
+                if widget.area().colliderect(area):
+                    widget.draw()
+        surface.set_clip(None)
@@ -0,0 +1,127 @@
+"""Parallax background baked into wrapping strips.
+
+Each layer (far hills, clouds, ground texture) is drawn once into a strip
+several screens wide whose right edge continues into its left edge. A
+frame then costs two blits per layer: the visible part of the strip from
+the scroll offset to its end, and the wrapped remainder from its start.
+The background costs the same however much detail the strips hold.
+
+Strips use a colour key rather than per-pixel alpha, so the sky behind
+shows through and the blits stay cheap.
+"""
+import math
+import random
+
+import pygame
+
+from simulation import WIDTH, GROUND_Y
+from sprite_cache import build_cloud
+
+STRIP_WIDTH = 3 * WIDTH
+KEY = (255, 0, 255)
+
+HILL_COLOR = (118, 158, 128)
+PEBBLE_COLOR = (90, 90, 90)
+
+# ================= STRIP BUILDERS =================
+# Each builder gets the strip width and a seeded rng and returns a keyed
+# surface that tiles horizontally with itself.
+
+def _strip(width, height):
+    surf = pygame.Surface((width, height))
+    surf.fill(KEY)
+    return surf
+
+def _wrapped_blit(strip, surf, x, y):
+    """Blit surf at x, and again one strip-width left if it hangs off the end."""
+    strip.blit(surf, (x, y))
+    if x + surf.get_width() > strip.get_width():
+        strip.blit(surf, (x - strip.get_width(), y))
+
+def bake_hills(width, rng, height=160):
+    strip = _strip(width, height)
+    # Whole numbers of periods across the strip keep the seam invisible
+    waves = [(rng.randint(1, 4) * n, rng.uniform(10, 30), rng.uniform(0, math.tau))
+             for n in (1, 2, 5)]
+    points = [(0, height)]
+    for x in range(0, width + 1, 8):
+        y = height * 0.45 + sum(amp * math.sin(math.tau * periods * x / width + phase)
+                                for periods, amp, phase in waves)
+        points.append((x, int(y)))
+    points.append((width, height))
+    pygame.draw.polygon(strip, HILL_COLOR, points)
+    return strip
+
+def bake_clouds(width, rng, height=300, count=12):
+    strip = _strip(width, height)
+    for i in range(count):
+        cloud, (dx, dy) = build_cloud(rng.randint(60, 100), rng.randint(30, 50))
+        x = (i * width // count + rng.randint(0, width // count)) % width
+        _wrapped_blit(strip, cloud, x + dx, rng.randint(50, 250) + dy)
+    return strip
+
+def bake_ground(width, rng, height=40, count=220):
+    strip = _strip(width, height)
+    for _ in range(count):
+        w, h = rng.randint(2, 8), rng.randint(1, 3)
+        pebble = pygame.Surface((w, h))
+        pebble.fill(PEBBLE_COLOR)
+        _wrapped_blit(strip, pebble, rng.randrange(width), rng.randint(6, height - h))
+    return strip
+
+# ================= LAYERS =================
+class Layer:
+    """One strip: `factor` is how fast it scrolls relative to the ground."""
+    def __init__(self, name, factor, y, builder):
+        self.name = name
+        self.factor = factor
+        self.y = y
+        self.builder = builder
+        self.strip = None
+
+DEFAULT_LAYERS = (
+    ("hills", 0.1, GROUND_Y - 160, bake_hills),
+    ("clouds", 0.3, 0, bake_clouds),
+    ("ground", 1.0, GROUND_Y, bake_ground),
+)
+
+class Parallax:
+    def __init__(self, layers=DEFAULT_LAYERS, seed=0, scale=1.0, width=STRIP_WIDTH):
+        self.layers = [Layer(*spec) for spec in layers]
+        self.seed = seed
+        self.width = width
+        self.scale = None
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        """Bake (or re-bake) every strip for a world layer at `scale`."""
+        if scale == self.scale:
+            return
+        self.scale = scale
+        rng = random.Random(self.seed)
+        for layer in self.layers:
+            strip = layer.builder(self.width, rng)
+            if scale != 1:
+                # Nearest-neighbour, so no pixel is blended with the key colour
+                strip = pygame.transform.scale(strip, (round(strip.get_width() * scale),
+                                                       round(strip.get_height() * scale)))
+            if pygame.display.get_surface() is not None:
+                strip = strip.convert()
+            strip.set_colorkey(KEY, pygame.RLEACCEL)
+            layer.strip = strip
+
+    def draw(self, surface, scroll):
+        """Blit every layer for a ground scroll of `scroll` logical pixels."""
+        k = self.scale
+        view = surface.get_width()
+        blits = []
+        for layer in self.layers:
+            strip = layer.strip
+            width, height = strip.get_size()
+            y = round(layer.y * k)
+            x = int(scroll * layer.factor * k) % width
+            first = min(width - x, view)
+            blits.append((strip, (0, y), (x, 0, first, height)))
+            if first < view:
+                blits.append((strip, (first, y), (0, 0, view - first, height)))
+        return surface.blits(blits)
@@ -0,0 +1,145 @@
+"""Frame-time profiler and performance overlay.
+
+The main loop calls lap(phase) after each piece of work; the time since
+the previous lap is charged to that phase. next_frame() closes the frame
+into a fixed-size ring buffer, which feeds the overlay (FPS, p50/p99
+frame time, per-phase averages, entity counts) and CSV dumps. cProfile
+can be switched on for the next N frames.
+"""
+import cProfile
+import csv
+import io
+import os
+import pstats
+import time
+
+PHASES = ("events", "player", "spawn", "entities", "collision",
+          "draw", "hud", "present", "idle")
+
+PROFILE_DIR = "profiles"
+
+class FrameProfiler:
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.samples = [None] * capacity
+        self.count = 0
+        self.slot = {phase: i for i, phase in enumerate(PHASES)}
+        self.current = [0.0] * len(PHASES)
+        self.last = time.perf_counter()
+        self.overlay = False
+        self._overlay_lines = []
+        self._cprofile = None
+        self._cprofile_frames = 0
+
+    # ---------------- recording ----------------
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.current[self.slot[phase]] += now - self.last
+        self.last = now
+
+    def next_frame(self):
+        """Close the running frame (the clock wait counts as idle)."""
+        self.lap("idle")
+        self.samples[self.count % self.capacity] = tuple(self.current)
+        self.count += 1
+        self.current = [0.0] * len(PHASES)
+
+        if self._cprofile is not None:
+            self._cprofile_frames -= 1
+            if self._cprofile_frames <= 0:
+                self._finish_cprofile()
+
+    def frames(self):
+        """Recorded frames, oldest first."""
+        if self.count <= self.capacity:
+            return self.samples[:self.count]
+        start = self.count % self.capacity
+        return self.samples[start:] + self.samples[:start]
+
+    # ---------------- statistics ----------------
+    def stats(self):
+        frames = self.frames()
+        if not frames:
+            return None
+        totals = sorted(sum(frame) for frame in frames)
+        n = len(totals)
+        mean = sum(totals) / n
+        return {
+            "fps": 1 / mean if mean else 0.0,
+            "p50_ms": totals[n // 2] * 1000,
+            "p99_ms": totals[min(n - 1, int(n * 0.99))] * 1000,
+            "phase_ms": {phase: sum(f[i] for f in frames) / n * 1000
+                         for phase, i in self.slot.items()},
+        }
+
+    # ---------------- overlay ----------------
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+
+    def overlay_lines(self, entities=None):
+        """Text for the overlay, refreshed a few times a second."""
+        if self.count % 15 == 0 or not self._overlay_lines:
+            stats = self.stats()
+            if stats is None:
+                return []
+            lines = [f"FPS {stats['fps']:.0f}  p50 {stats['p50_ms']:.1f}ms  "
+                     f"p99 {stats['p99_ms']:.1f}ms"]
+            busy = [(p, ms) for p, ms in stats["phase_ms"].items() if p != "idle"]
+            lines.append("  ".join(f"{p} {ms:.2f}" for p, ms in busy[:4]))
+            lines.append("  ".join(f"{p} {ms:.2f}" for p, ms in busy[4:]))
+            if entities is not None:
+                lines.append("  ".join(
+                    f"{kind} {entities.count(kind)}/{entities.peak[kind]}"
+                    for kind in entities.caps))
+            self._overlay_lines = lines
+        return self._overlay_lines
+
+    # ---------------- dumps ----------------
+    def _path(self, stem, ext):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        return os.path.join(PROFILE_DIR, f"{stem}_{time.strftime('%Y%m%d-%H%M%S')}.{ext}")
+
+    def dump_csv(self, path=None):
+        path = path or self._path("frames", "csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([f"{phase}_ms" for phase in PHASES] + ["total_ms"])
+            for frame in self.frames():
+                writer.writerow([f"{t * 1000:.3f}" for t in frame] +
+                                [f"{sum(frame) * 1000:.3f}"])
+        return path
+
+    def profile_frames(self, frames=300):
+        """Run cProfile over the next `frames` frames, then dump it."""
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile_frames = frames
+            self._cprofile.enable()
+
+    def _finish_cprofile(self):
+        self._cprofile.disable()
+        path = self._path("cprofile", "prof")
+        self._cprofile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(15)
+        print(f"cProfile written to {path}")
+        print(out.getvalue())
+        self._cprofile = None
+
+# ================= STARTUP =================
+class StartupTimer:
+    """Wall-clock breakdown of startup, one entry per mark()."""
+    def __init__(self, started=None):
+        self.started = self.last = time.perf_counter() if started is None else started
+        self.phases = []
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to `phase`."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = [f"{phase:<16} {seconds * 1000:8.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"{'total':<16} {(self.last - self.started) * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,137 @@
+"""Compact replays: a run is its seed plus the ticks the player jumped on.
+
+File layout (little endian):
+    header  b"CHRP", version u8, seed u32, end tick u32, jump count u32,
+            gender u8 (index into GENDERS; picks the collision masks)
+    body    jump ticks as LEB128 varint deltas
+
+Usage:
+    python replay.py run.rpl
+    python replay.py run.rpl --distance 412 --diamonds 9
+"""
+import argparse
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from assets import AssetManager, GENDER_PREFIX
+from simulation import World, step
+
+MAGIC = b"CHRP"
+# Bumped whenever the simulation changes what a seed plays out to
+VERSION = 3
+HEADER = struct.Struct("<4sBIIIB")
+GENDERS = tuple(GENDER_PREFIX)
+
+Replay = namedtuple("Replay", "seed end_tick jump_ticks gender")
+
+# ================= ENCODING =================
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _decode_varints(data):
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+def dumps(replay):
+    out = bytearray(HEADER.pack(MAGIC, VERSION, replay.seed, replay.end_tick,
+                                len(replay.jump_ticks),
+                                GENDERS.index(replay.gender)))
+    last = 0
+    for tick in replay.jump_ticks:
+        _encode_varint(tick - last, out)
+        last = tick
+    return bytes(out)
+
+def loads(data):
+    magic, version, seed, end_tick, count, gender = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a Chaser replay (or unsupported version)")
+
+    jump_ticks = []
+    tick = 0
+    for delta in _decode_varints(data[HEADER.size:]):
+        tick += delta
+        jump_ticks.append(tick)
+    if len(jump_ticks) != count:
+        raise ValueError("truncated replay")
+
+    return Replay(seed, end_tick, jump_ticks, GENDERS[gender])
+
+def save(path, replay):
+    with open(path, "wb") as f:
+        f.write(dumps(replay))
+
+def load(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+# ================= RECORDING =================
+class ReplayRecorder:
+    """Call record() with each tick's inputs right before step()."""
+    def __init__(self, world):
+        self.world = world
+        self.jump_ticks = []
+
+    def record(self, inputs):
+        # Only jumps that actually fire matter; step() applies them first
+        if "jump" in inputs and self.world.player.on_ground:
+            self.jump_ticks.append(self.world.tick + 1)
+
+    def replay(self):
+        world = self.world
+        return Replay(world.seed, world.tick, list(self.jump_ticks),
+                      world.player.gender)
+
+# ================= PLAYBACK =================
+def simulate(replay):
+    """Re-run a replay at full speed with no rendering; returns the World."""
+    masks = AssetManager().player_masks(replay.gender)
+    world = World(replay.gender, masks, replay.seed)
+    jumps = set(replay.jump_ticks)
+    jump = ("jump",)
+    while not world.game_over and world.tick < replay.end_tick:
+        step(world, jump if world.tick + 1 in jumps else ())
+    return world
+
+def verify(replay, distance, diamonds):
+    """True if the replay really reaches the claimed score."""
+    world = simulate(replay)
+    return int(world.distance) == int(distance) and \
+        world.diamonds_collected == diamonds
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate a Chaser replay.")
+    parser.add_argument("path")
+    parser.add_argument("--distance", type=int)
+    parser.add_argument("--diamonds", type=int)
+    args = parser.parse_args(argv)
+
+    replay = load(args.path)
+    started = time.perf_counter()
+    world = simulate(replay)
+    elapsed = time.perf_counter() - started
+
+    print(f"seed {replay.seed}: {world.tick} ticks "
+          f"({world.time:.1f}s of play) in {elapsed * 1000:.1f} ms")
+    print(f"distance {int(world.distance)}, diamonds {world.diamonds_collected}")
+
+    if args.distance is None and args.diamonds is None:
+        return 0
+    ok = (args.distance is None or int(world.distance) == args.distance) and \
+        (args.diamonds is None or world.diamonds_collected == args.diamonds)
+    print("claim verified" if ok else "claim REJECTED")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
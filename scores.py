@@ -0,0 +1,169 @@
+"""Run history and high scores in SQLite.
+
+Every finished run is one row. The database runs in WAL mode so the game
+can read the leaderboard while the writer thread commits. Each insert
+batch is a single transaction, so a crash never leaves a half-written
+score behind. The indexes on distance and on (username, distance) turn
+top-N and personal-best queries into index walks, not table scans.
+
+Usage:
+    python scores.py                 # top 10
+    python scores.py --user alice    # alice's best and recent runs
+"""
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+
+DB_FILE = "scores.db"
+LEGACY_FILE = "highscore.json"
+
+Run = namedtuple("Run", "username age gender distance diamonds duration seed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id        INTEGER PRIMARY KEY,
+    username  TEXT    NOT NULL,
+    age       INTEGER,
+    gender    TEXT,
+    distance  REAL    NOT NULL,
+    diamonds  INTEGER NOT NULL,
+    duration  REAL    NOT NULL,
+    seed      INTEGER,
+    played_at REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_distance ON runs (distance DESC);
+CREATE INDEX IF NOT EXISTS runs_by_user ON runs (username, distance DESC);
+"""
+
+INSERT = """INSERT INTO runs (username, age, gender, distance, diamonds,
+                              duration, seed, played_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+COLUMNS = "username, age, gender, distance, diamonds, duration, seed"
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps committed transactions atomic; NORMAL only skips the
+    # fsync per commit, which can lose the very last run on power loss
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class ScoreStore:
+    """Queries run on the caller's thread; record() hands rows to a writer."""
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._conn = _connect(path)
+        self._conn.executescript(SCHEMA)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    # ---------------- writing ----------------
+    def record(self, run):
+        """Queue a finished Run; returns immediately."""
+        self._queue.put(tuple(run) + (time.time(),))
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        closing = False
+        while not closing:
+            rows = [self._queue.get()]
+            # Whatever piled up meanwhile goes into the same transaction
+            while True:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in rows:
+                closing = True
+                rows = [row for row in rows if row is not None]
+            if not rows:
+                continue
+            try:
+                with conn:
+                    conn.executemany(INSERT, rows)
+            except sqlite3.Error as e:
+                print(f"Could not save {len(rows)} run(s): {e}", file=sys.stderr)
+        conn.close()
+
+    def close(self):
+        """Flush queued runs and stop the writer."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._conn.close()
+
+    # ---------------- queries ----------------
+    def top(self, n=10):
+        """The n longest runs, best first."""
+        rows = self._conn.execute(
+            f"SELECT {COLUMNS} FROM runs ORDER BY distance DESC LIMIT ?", (n,))
+        return [Run(*row) for row in rows]
+
+    def personal_best(self, username):
+        """username's longest run, or None."""
+        row = self._conn.execute(
+            f"SELECT {COLUMNS} FROM runs WHERE username = ? "
+            "ORDER BY distance DESC LIMIT 1", (username,)).fetchone()
+        return Run(*row) if row else None
+
+    def recent(self, username, n=10):
+        rows = self._conn.execute(
+            f"SELECT {COLUMNS} FROM runs WHERE username = ? "
+            "ORDER BY id DESC LIMIT ?", (username, n))
+        return [Run(*row) for row in rows]
+
+    # ---------------- migration ----------------
+    def import_legacy(self, path=LEGACY_FILE):
+        """Move the old single-number highscore.json into the table, once."""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                distance = float(json.load(f).get("distance", 0))
+        except (OSError, ValueError, AttributeError):
+            distance = 0  # empty or corrupt: nothing worth keeping
+        if distance > 0:
+            with self._conn:
+                self._conn.execute(INSERT, ("", None, None, distance, 0, 0.0,
+                                            None, os.path.getmtime(path)))
+        os.replace(path, path + ".migrated")
+
+# ================= CLI =================
+def _format(run):
+    name = run.username or "(legacy)"
+    return (f"{name:<20} {int(run.distance):>8} {run.diamonds:>8} "
+            f"{run.duration:>8.1f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show Chaser high scores.")
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--user", help="show this player's best and recent runs")
+    args = parser.parse_args(argv)
+
+    store = ScoreStore(args.db)
+    print(f"{'player':<20} {'distance':>8} {'diamonds':>8} {'time':>9}")
+    if args.user:
+        best = store.personal_best(args.user)
+        if best is None:
+            print(f"no runs for {args.user}")
+        else:
+            print(_format(best), " (best)")
+            for run in store.recent(args.user, args.top):
+                print(_format(run))
+    else:
+        for run in store.top(args.top):
+            print(_format(run))
+    store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
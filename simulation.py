@@ -0,0 +1,623 @@
+"""Display-free game logic for Chaser.
+
+World state and step() only use pygame.Rect, so the simulation runs without
+a window (or with SDL_VIDEODRIVER=dummy). The game window is just one
+consumer of this state.
+"""
+import random
+import time
+from collections import namedtuple
+
+import pygame
+
+from collision import sort_lane, collide, shape_mask, fallback_player_mask
+
+# ================= SETTINGS =================
+WIDTH, HEIGHT = 800, 800
+GROUND_Y = 650
+PLAYER_X = 150
+FPS = 60
+
+# The simulation always advances in whole ticks of TICK_DT seconds
+TICK_RATE = 60
+TICK_DT = 1 / TICK_RATE
+MAX_CATCHUP_TICKS = 5
+
+START_LIVES = 3
+START_SPEED = 5
+SPAWN_TICKS = 90        # 1.5 s
+CLOUD_TICKS = 180       # 3 s
+INVINCIBLE_TICKS = 60   # 1 s
+
+# Balance knobs; the defaults are the shipped game (tuned with balance.py).
+# speed_steps are (distance, speed) pairs, highest distance first.
+Difficulty = namedtuple("Difficulty", [
+    "box_chance", "spike_chance", "spawn_ticks", "start_speed",
+    "speed_steps", "jump_power", "gravity"])
+
+DEFAULT_DIFFICULTY = Difficulty(
+    box_chance=0.6,
+    spike_chance=0.25,
+    spawn_ticks=SPAWN_TICKS,
+    start_speed=START_SPEED,
+    speed_steps=((300, 10), (150, 7)),
+    jump_power=-20,
+    gravity=1.1)
+
+# ================= PLAYER =================
+class Player:
+    def __init__(self, gender="Male", masks=None):
+        self.x = PLAYER_X
+        self.y = GROUND_Y
+        self.prev_y = self.y
+        self.vel = 0
+        self.gravity = 1.1
+        self.jump_power = -20
+        self.on_ground = True
+        self.invincible = False
+        self.inv_time = 0
+        self.gender = gender
+        # Collision masks of the idle and jump sprites; the hitbox follows
+        # their size. None means the shape-drawn fallback player.
+        self.masks = masks
+        if masks is not None:
+            self.idle_size, self.jump_size = (mask.get_size() for mask in masks)
+        else:
+            self.idle_size = self.jump_size = None
+        self.hitbox = self._get_display_rect()
+
+    def jump(self):
+        if self.on_ground:
+            self.vel = self.jump_power
+            self.on_ground = False
+
+    def update(self, tick):
+        self.prev_y = self.y
+        self.vel += self.gravity
+        self.y += self.vel
+
+        if self.y >= GROUND_Y:
+            self.y = GROUND_Y
+            self.vel = 0
+            self.on_ground = True
+
+        if self.invincible and tick - self.inv_time > INVINCIBLE_TICKS:
+            self.invincible = False
+
+        # One hitbox per tick, shared by every collision query
+        self.hitbox = self._get_display_rect()
+
+    def pose(self, y, on_ground):
+        """Put the player at y without running physics (see ghost.Ghost)."""
+        self.prev_y = self.y
+        self.y = y
+        self.on_ground = on_ground
+        self.hitbox = self._get_display_rect()
+
+    def _get_display_rect(self):
+        """Calculate hitbox that matches rendered sprite exactly."""
+        size = self.jump_size if not self.on_ground else self.idle_size
+
+        if size is not None:
+            sprite_w, sprite_h = size
+
+            # Position: bottom aligned with ground (self.y), centered on self.x
+            screen_x = self.x - sprite_w // 2
+            screen_y = self.y - sprite_h
+
+            # Clamp to screen bounds (prevents sprite going off-screen)
+            screen_x = max(0, min(screen_x, WIDTH - sprite_w))
+            screen_y = max(0, screen_y)
+
+            return pygame.Rect(screen_x, screen_y, sprite_w, sprite_h)
+        else:
+            # Fallback hitbox for shape-based rendering
+            return pygame.Rect(self.x + 10, self.y - 70, 20, 70)
+
+    def rect(self):
+        return self.hitbox
+
+    @property
+    def mask(self):
+        if self.masks is None:
+            return fallback_player_mask()
+        return self.masks[0] if self.on_ground else self.masks[1]
+
+# ================= OBSTACLE =================
+OBSTACLE_WIDTHS = {"box": 40, "spike": 25, "tall": 40}
+
+def roll_height(obstacle_type, rng=random):
+    if obstacle_type == "box":
+        return rng.randint(40, 70)
+    if obstacle_type == "tall":
+        return rng.randint(80, 100)
+    return 60
+
+# Scrolling entities are slotted and initialised through reset(), so a
+# Pool can recycle despawned instances instead of allocating new ones.
+class Obstacle:
+    __slots__ = ("x", "prev_x", "y", "speed", "hit", "type",
+                 "width", "height", "hitbox", "mask", "alive")
+
+    def __init__(self, speed, obstacle_type, height=None, rng=random):
+        self.hitbox = pygame.Rect(0, 0, 0, 0)
+        self.reset(speed, obstacle_type, height, rng)
+
+    def reset(self, speed, obstacle_type, height=None, rng=random):
+        self.x = WIDTH
+        self.prev_x = self.x
+        self.y = GROUND_Y
+        self.speed = speed
+        self.hit = False  # Track if spike has spawned diamonds
+        self.alive = True
+
+        # The type comes from the level schedule (see generate_level)
+        self.type = obstacle_type
+
+        # Set dimensions based on type; height is rolled unless given
+        self.width = OBSTACLE_WIDTHS[self.type]
+        self.height = height if height is not None else roll_height(self.type, rng)
+
+        self.hitbox.update(self.x, self.y - self.height,
+                           self.width, self.height)
+        self.mask = shape_mask(self.type, self.width, self.height)
+
+    def update(self):
+        self.prev_x = self.x
+        self.x -= self.speed
+        self.hitbox.x = self.x
+
+    def rect(self):
+        return self.hitbox
+
+    @property
+    def despawn_x(self):
+        return -self.width
+
+    def off_screen(self):
+        return self.x < self.despawn_x
+
+# ================= DIAMOND =================
+class Diamond:
+    __slots__ = ("x", "prev_x", "y", "speed", "hitbox", "mask", "alive")
+
+    despawn_x = -24
+
+    def __init__(self, speed, rng=random, y=None):
+        self.hitbox = pygame.Rect(0, 0, 24, 24)
+        self.mask = shape_mask("diamond")
+        self.reset(speed, rng, y)
+
+    def reset(self, speed, rng=random, y=None):
+        self.x = WIDTH
+        self.prev_x = self.x
+        self.y = y if y is not None else GROUND_Y - rng.randint(120, 180)
+        self.speed = speed
+        self.alive = True
+        self.hitbox.topleft = (self.x, self.y - 12)
+
+    def move_to(self, x, y):
+        self.x = self.prev_x = x
+        self.y = y
+        self.hitbox.topleft = (x, y - 12)
+
+    def update(self):
+        self.prev_x = self.x
+        self.x -= self.speed
+        self.hitbox.x = self.x
+
+    def rect(self):
+        return self.hitbox
+
+    def off_screen(self):
+        return self.x < self.despawn_x
+
+# ================= CLOUD =================
+# A few size variants, so the sprite cache can hold every cloud shape
+CLOUD_WIDTHS = (60, 70, 80, 90, 100)
+CLOUD_HEIGHTS = (30, 35, 40, 45, 50)
+
+class Cloud:
+    __slots__ = ("x", "prev_x", "y", "speed", "width", "height", "alive")
+
+    despawn_x = -100
+
+    def __init__(self, speed, rng=random):
+        self.reset(speed, rng)
+
+    def reset(self, speed, rng=random):
+        self.x = WIDTH + 50
+        self.prev_x = self.x
+        self.y = rng.randint(50, 250)
+        self.speed = speed
+        self.width = rng.choice(CLOUD_WIDTHS)
+        self.height = rng.choice(CLOUD_HEIGHTS)
+        self.alive = True
+
+    def update(self):
+        self.prev_x = self.x
+        self.x -= self.speed * 0.3
+
+    def off_screen(self):
+        return self.x < self.despawn_x
+
+# ================= POOLING =================
+class Pool:
+    """Free list of despawned entities, recycled through their reset()."""
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args, **kwargs)
+            return entity
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, entity):
+        entity.alive = False
+        self.free.append(entity)
+
+ENTITY_CLASSES = {"obstacle": Obstacle, "diamond": Diamond, "cloud": Cloud}
+
+# ================= ENTITY MANAGER =================
+# Hard cap on live entities per kind; the oldest (left-most) is dropped first
+ENTITY_CAPS = {"obstacle": 16, "diamond": 32, "cloud": 8}
+# Widest entity of each collidable kind, bounds the broad-phase search
+MAX_WIDTH = {"obstacle": 40, "diamond": 24}
+
+class EntityManager:
+    """Owns every scrolling entity so per-frame work stays bounded.
+
+    Each kind's list is kept sorted by x (see advance), which the broad
+    phase and culling rely on. Removal only clears an entity's alive flag;
+    the list is compacted once in cull() and the entity goes back to its
+    kind's pool. entity_store.ArrayEntityManager is a NumPy backed drop-in
+    with the same interface for headless runs.
+    """
+    def __init__(self, caps=ENTITY_CAPS):
+        self.caps = dict(caps)
+        self.live = {kind: [] for kind in self.caps}
+        self.peak = {kind: 0 for kind in self.caps}
+        self.pools = {kind: Pool(ENTITY_CLASSES[kind]) for kind in self.caps}
+        self._removed = {kind: 0 for kind in self.caps}
+
+    def create(self, kind, *args, **kwargs):
+        """Spawn a (possibly recycled) entity of kind built from args."""
+        return self.spawn(kind, self.pools[kind].acquire(*args, **kwargs))
+
+    def spawn(self, kind, entity):
+        items = self.live[kind]
+        if len(items) >= self.caps[kind]:
+            self.pools[kind].release(items.pop(0))
+        items.append(entity)
+        if len(items) > self.peak[kind]:
+            self.peak[kind] = len(items)
+        return entity
+
+    def remove(self, kind, entity):
+        if entity.alive:
+            entity.alive = False
+            self._removed[kind] += 1
+
+    def advance(self, kind):
+        """Move every entity of kind one tick, keeping the lane sorted."""
+        items = self.live[kind]
+        for entity in items:
+            entity.update()
+        sort_lane(items)
+
+    def hits(self, kind, rect, mask=None):
+        """Live entities of kind overlapping rect (and mask, if given)."""
+        return [e for e in collide(self.live[kind], rect, MAX_WIDTH[kind], mask)
+                if e.alive]
+
+    def cull(self):
+        """Despawn everything removed or past the left edge, into the pools."""
+        for kind, items in self.live.items():
+            pool = self.pools[kind]
+            # Sorted by x, so the off-screen ones are at the front
+            gone = 0
+            while gone < len(items) and items[gone].off_screen():
+                pool.release(items[gone])
+                gone += 1
+            del items[:gone]
+
+            if self._removed[kind]:
+                for entity in items:
+                    if not entity.alive:
+                        pool.release(entity)
+                items[:] = [e for e in items if e.alive]
+                self._removed[kind] = 0
+
+    def count(self, kind):
+        return len(self.live[kind]) - self._removed[kind]
+
+    def clear(self):
+        for kind, items in self.live.items():
+            for entity in items:
+                self.pools[kind].release(entity)
+            items.clear()
+            self._removed[kind] = 0
+
+# ================= SCHEDULING =================
+class SpawnScheduler:
+    """Fires each kind every N ticks, so spawns follow simulated time."""
+    def __init__(self, intervals):
+        self.intervals = dict(intervals)
+        # Start due so the first obstacle and cloud appear immediately
+        self.next_tick = {kind: 0 for kind in self.intervals}
+
+    def due(self, kind, tick):
+        if tick < self.next_tick[kind]:
+            return False
+        self.next_tick[kind] = tick + self.intervals[kind]
+        return True
+
+class FixedTimestep:
+    """Accumulates real frame time and hands it out as whole ticks.
+
+    A slow frame runs several ticks to catch up; past MAX_CATCHUP_TICKS the
+    backlog is dropped instead of letting the game spiral further behind.
+    """
+    def __init__(self, tick_dt=TICK_DT, max_ticks=MAX_CATCHUP_TICKS):
+        self.tick_dt = tick_dt
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        self.accumulator += frame_dt
+        ticks = int(self.accumulator / self.tick_dt)
+        if ticks > self.max_ticks:
+            ticks = self.max_ticks
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_dt
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far the renderer is between the previous and current tick."""
+        return min(self.accumulator / self.tick_dt, 1.0)
+
+def lerp(prev, cur, alpha):
+    return prev + (cur - prev) * alpha
+
+# ================= LEVEL =================
+# Obstacle spawns follow a schedule of Chunks worked out ahead of play:
+# one per obstacle spawn, with the obstacle (type None for a gap) and the
+# height of the diamond that comes with it (None for no diamond).
+Chunk = namedtuple("Chunk", "type height diamond_y")
+
+# Offsets that derive independent RNG streams from one run seed
+SPAWN_STREAM = 0x5EED
+CLOUD_STREAM = 0xC10D
+LEVEL_STREAM = 0x1E7E1
+
+def speed_schedule(difficulty=DEFAULT_DIFFICULTY):
+    """The world's speed on tick 1, 2, ...; it only depends on the tick."""
+    speed, distance = difficulty.start_speed, 0
+    while True:
+        yield speed
+        # Same arithmetic, in the same order, as the end of step()
+        distance += speed * 0.05
+        for threshold, tier_speed in difficulty.speed_steps:
+            if distance > threshold:
+                speed = tier_speed
+                break
+
+def airtime(difficulty=DEFAULT_DIFFICULTY):
+    """Ticks a jump keeps the player off the ground."""
+    vel, height, ticks = difficulty.jump_power, 0, 0
+    while True:
+        vel += difficulty.gravity
+        height += vel
+        ticks += 1
+        if height >= 0:
+            return ticks
+
+def generate_level(seed, difficulty=DEFAULT_DIFFICULTY, fair=True):
+    """Endless Chunk schedule for a run, with no unfair sequences in it.
+
+    Two rules hold: a spike never follows a tall obstacle (the tall one
+    needs a late jump and the spike leaves no room to land), and nothing
+    reaches the player less than one jump plus a landing tick after the
+    obstacle before it; such a chunk becomes a gap. Arrival ticks come from
+    speed_schedule(), since a faster obstacle can catch up a slower one.
+    fair=False drops both rules, for stress runs that want every spawn.
+    """
+    rng = random.Random(seed ^ LEVEL_STREAM)
+    box, box_spike = difficulty.box_chance, difficulty.box_chance + difficulty.spike_chance
+    min_gap = airtime(difficulty) + 1
+    speeds = speed_schedule(difficulty)
+    tick = 0
+    previous, previous_arrival = None, None
+    while True:
+        # Obstacles are due on ticks 1, 1 + spawn_ticks, ...
+        speed = next(speeds)
+        tick += 1
+
+        roll = rng.random()
+        kind = "box" if roll < box else "spike" if roll < box_spike else "tall"
+        if fair and kind == "spike" and previous == "tall":
+            kind = "box"
+        height = roll_height(kind, rng)
+        diamond_y = GROUND_Y - rng.randint(120, 180) if rng.random() > 0.2 else None
+
+        arrival = tick - (-(WIDTH - PLAYER_X) // speed)
+        if fair and previous_arrival is not None and arrival - previous_arrival < min_gap:
+            kind = height = None
+        else:
+            previous, previous_arrival = kind, arrival
+        yield Chunk(kind, height, diamond_y)
+
+        for _ in range(difficulty.spawn_ticks - 1):
+            next(speeds)
+        tick += difficulty.spawn_ticks - 1
+
+# ================= WORLD =================
+
+class World:
+    """Everything needed to advance one run, with its own tick clock.
+
+    All randomness comes from streams seeded by `seed`, so the same seed and
+    the same jump ticks always reproduce the same run. `level` builds the
+    Chunk iterator from (seed, difficulty); level_stream.LevelStream yields
+    the same chunks as the default, from a worker thread. `telemetry` (a
+    telemetry.Telemetry, or None) is told about spawns, hits and the like.
+    """
+    def __init__(self, gender="Male", player_masks=None, seed=None, entities=None,
+                 difficulty=DEFAULT_DIFFICULTY, clouds=True, level=generate_level,
+                 telemetry=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        # Clouds get their own stream so cosmetic spawns never shift gameplay
+        self.rng = random.Random(seed ^ SPAWN_STREAM)
+        self.cloud_rng = random.Random(seed ^ CLOUD_STREAM)
+        self.difficulty = difficulty
+        self.level = level(seed, difficulty)
+        self.player = Player(gender, player_masks)
+        self.player.jump_power = difficulty.jump_power
+        self.player.gravity = difficulty.gravity
+        self.lives = START_LIVES
+        self.distance = 0
+        # Pixels the ground has moved, for backgrounds that scroll with it
+        self.scroll = self.prev_scroll = 0
+        self.diamonds_collected = 0
+        self.speed = difficulty.start_speed
+        self.entities = entities if entities is not None else EntityManager()
+        self.spawns = SpawnScheduler({"obstacle": difficulty.spawn_ticks,
+                                      "cloud": CLOUD_TICKS})
+        # Cloud entities are cosmetic; the game draws parallax strips instead
+        self.clouds = clouds
+        self.tick = 0
+        self.game_over = False
+        self.telemetry = telemetry
+        if telemetry:
+            telemetry.emit("run", 0, seed, gender)
+
+    @property
+    def time(self):
+        return self.tick * TICK_DT
+
+def step(world, inputs=(), lap=None):
+    """Advance the world by exactly one tick.
+
+    inputs is a collection of action names; only "jump" is understood.
+    lap, if given, is called with a phase name after each part of the tick
+    (see profiler.FrameProfiler.lap).
+    """
+    if world.game_over:
+        return world
+
+    world.tick += 1
+    tick = world.tick
+    player = world.player
+    entities = world.entities
+    spawns = world.spawns
+    speed = world.speed
+    telemetry = world.telemetry
+
+    if "jump" in inputs:
+        player.jump()
+
+    if world.clouds and spawns.due("cloud", tick):
+        entities.create("cloud", speed, world.cloud_rng)
+    if lap:
+        lap("spawn")
+
+    entities.advance("cloud")
+    if lap:
+        lap("entities")
+
+    player.update(tick)
+    player_rect = player.rect()
+    player_mask = player.mask
+    if lap:
+        lap("player")
+
+    # Controlled spawn spacing
+    if spawns.due("obstacle", tick):
+        chunk = next(world.level)
+        if chunk.type is not None:
+            entities.create("obstacle", speed, chunk.type, height=chunk.height)
+        if chunk.diamond_y is not None:
+            entities.create("diamond", speed, y=chunk.diamond_y)
+        if telemetry:
+            telemetry.emit("spawn", tick, chunk.type, chunk.diamond_y is not None)
+    if lap:
+        lap("spawn")
+
+    entities.advance("obstacle")
+    if lap:
+        lap("entities")
+
+    for obs in entities.hits("obstacle", player_rect, player_mask):
+        if not player.invincible:
+            world.lives -= 1
+            player.invincible = True
+            player.inv_time = tick
+            if telemetry:
+                telemetry.emit("hit", tick, obs.type, world.lives)
+
+            # Spawn diamonds if hit a spike (only once per spike)
+            if obs.type == "spike" and not obs.hit:
+                obs.hit = True
+                num_diamonds = world.rng.randint(1, 3)
+                for _ in range(num_diamonds):
+                    # Create diamond at spike position with slight offset
+                    diamond = entities.create("diamond", speed, world.rng)
+                    diamond.move_to(obs.x + obs.width // 2, obs.y - obs.height - 20)
+
+            if world.lives <= 0:
+                world.game_over = True
+                if telemetry:
+                    telemetry.emit("end", tick, round(world.distance, 2),
+                                   world.diamonds_collected)
+    if lap:
+        lap("collision")
+
+    entities.advance("diamond")
+    if lap:
+        lap("entities")
+
+    for dia in entities.hits("diamond", player_rect, player_mask):
+        world.diamonds_collected += 1
+        entities.remove("diamond", dia)
+        if telemetry:
+            telemetry.emit("diamond", tick)
+    if lap:
+        lap("collision")
+
+    entities.cull()
+
+    world.distance += speed * 0.05
+    world.prev_scroll = world.scroll
+    world.scroll += speed
+
+    for threshold, tier_speed in world.difficulty.speed_steps:
+        if world.distance > threshold:
+            if telemetry and tier_speed != world.speed:
+                telemetry.emit("speed", tick, tier_speed, round(world.distance, 2))
+            world.speed = tier_speed
+            break
+
+    if lap:
+        lap("entities")
+    return world
+
+# ================= HEADLESS RUN =================
+if __name__ == "__main__":
+    world = World()
+    ticks = 0
+    started = time.perf_counter()
+    while not world.game_over:
+        step(world, ("jump",) if ticks % 45 == 0 else ())
+        ticks += 1
+    elapsed = time.perf_counter() - started
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks / elapsed:.0f} ticks/s), "
+          f"distance {int(world.distance)}, diamonds {world.diamonds_collected}")
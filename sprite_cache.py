@@ -0,0 +1,114 @@
+"""Pre-rendered surfaces for the procedurally drawn entities.
+
+Clouds, obstacles and diamonds only vary by a few size parameters, so each
+shape is drawn once into a Surface and afterwards drawn with a single blit
+(or batched through Surface.blits).
+"""
+from collections import OrderedDict
+
+import pygame
+
+BLACK = (30, 30, 30)
+CLOUD_COLOR = (220, 220, 220)
+DIAMOND_COLOR = (255, 215, 0)
+
+# ================= SHAPE BUILDERS =================
+# Each builder returns (surface, offset); blit the surface at the entity's
+# anchor point plus offset to match the old per-primitive drawing.
+
+def _new_surface(width, height):
+    return pygame.Surface((width, height), pygame.SRCALPHA)
+
+def build_cloud(width, height):
+    r = height // 2
+    left, top = -r, -r - 15
+    right = max(60 + r, 25 + r, width)
+    bottom = max(r, 5)
+    surf = _new_surface(right - left + 1, bottom - top + 1)
+    ox, oy = -left, -top
+    pygame.draw.circle(surf, CLOUD_COLOR, (ox, oy), r)
+    pygame.draw.circle(surf, CLOUD_COLOR, (ox + 20, oy - 10), r + 5)
+    pygame.draw.circle(surf, CLOUD_COLOR, (ox + 40, oy), r)
+    pygame.draw.circle(surf, CLOUD_COLOR, (ox + 60, oy - 8), r)
+    pygame.draw.rect(surf, CLOUD_COLOR, (ox, oy - r, width, r + 5))
+    return surf, (left, top)
+
+def build_block(width, height):
+    surf = _new_surface(width, height)
+    surf.fill(BLACK)
+    return surf, (0, -height)
+
+def build_spike(width, height):
+    surf = _new_surface(width + 1, height + 1)
+    pygame.draw.polygon(surf, BLACK, [
+        (0, height),
+        (width, height),
+        (width // 2, 0)
+    ])
+    return surf, (0, -height)
+
+def build_diamond():
+    surf = _new_surface(25, 25)
+    pygame.draw.polygon(surf, DIAMOND_COLOR, [
+        (0, 12),
+        (12, 0),
+        (24, 12),
+        (12, 24)
+    ])
+    return surf, (0, -12)
+
+BUILDERS = {
+    "cloud": build_cloud,
+    "box": build_block,
+    "tall": build_block,
+    "spike": build_spike,
+    "diamond": build_diamond,
+}
+
+# ================= CACHE =================
+class SpriteCache:
+    """LRU of (kind, dims, alpha) -> (surface, offset).
+
+    With a scale other than 1 every shape is built at full size, then
+    shrunk once, and blit_args() returns positions in scaled pixels.
+    """
+    def __init__(self, max_entries=128, scale=1.0):
+        self.max_entries = max_entries
+        self.scale = scale
+        self.entries = OrderedDict()
+
+    def set_scale(self, scale):
+        if scale != self.scale:
+            self.scale = scale
+            self.clear()
+
+    def get(self, kind, *dims, alpha=None):
+        key = (kind, dims, alpha)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+
+        surf, offset = BUILDERS[kind](*dims)
+        k = self.scale
+        if k != 1:
+            size = (max(1, round(surf.get_width() * k)), max(1, round(surf.get_height() * k)))
+            surf = pygame.transform.smoothscale(surf, size)
+            offset = (round(offset[0] * k), round(offset[1] * k))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        if alpha is not None:
+            surf.set_alpha(alpha)
+        entry = self.entries[key] = (surf, offset)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+    def blit_args(self, kind, x, y, *dims, alpha=None):
+        """(surface, dest) pair ready for Surface.blit / Surface.blits."""
+        surf, (dx, dy) = self.get(kind, *dims, alpha=alpha)
+        k = self.scale
+        return surf, (x * k + dx, y * k + dy)
+
+    def clear(self):
+        self.entries.clear()
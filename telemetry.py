@@ -0,0 +1,207 @@
+"""Per-run gameplay telemetry, written off the frame loop.
+
+step() and the game loop call emit(), which only appends a tuple to an
+in-memory ring buffer. A writer thread drains it every FLUSH_SECONDS and
+writes the batch with one write() call. If the writer ever falls behind by
+a whole buffer, the oldest events are overwritten and a "dropped" record
+counts them.
+
+Each event is one JSON array per line: [kind, tick, fields...].
+    run      seed, gender               a run starts
+    spawn    obstacle type or null, diamond (bool)
+    hit      obstacle type, lives left  a life is lost
+    diamond                             a diamond is picked up
+    speed    new speed, distance        a speed tier is reached
+    frames   count, mean ms, max ms     frame times, once per FRAME_BATCH frames
+    end      distance, diamonds         game over
+    dropped  count
+
+The log rotates by size like logging.handlers.RotatingFileHandler:
+telemetry.log is the newest, telemetry.log.1 the next older, and so on.
+
+Usage:
+    python telemetry.py                      # aggregate telemetry/*
+    python telemetry.py telemetry/telemetry.log.2
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+from collections import Counter, deque
+
+TELEMETRY_DIR = "telemetry"
+LOG_NAME = "telemetry.log"
+FLUSH_SECONDS = 0.5
+FRAME_BATCH = 60
+
+class Telemetry:
+    def __init__(self, directory=TELEMETRY_DIR, capacity=8192,
+                 max_bytes=1 << 20, backups=5):
+        self.path = os.path.join(directory, LOG_NAME)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer = deque(maxlen=capacity)
+        self._dropped = 0
+        self._frames = []
+        self._closed = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    # ---------------- recording (main thread) ----------------
+    def emit(self, kind, tick, *fields):
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self._dropped += 1
+        buffer.append((kind, tick) + fields)
+
+    def frame(self, tick, dt):
+        """Collect one frame time; emits a "frames" summary per FRAME_BATCH."""
+        frames = self._frames
+        frames.append(dt)
+        if len(frames) >= FRAME_BATCH:
+            self.emit("frames", tick, len(frames),
+                      round(sum(frames) / len(frames) * 1000, 2),
+                      round(max(frames) * 1000, 2))
+            frames.clear()
+
+    # ---------------- writing (writer thread) ----------------
+    def _write_loop(self):
+        closing = False
+        while not closing:
+            closing = self._closed.wait(FLUSH_SECONDS)
+            self._flush()
+        self._file.close()
+
+    def _flush(self):
+        buffer = self._buffer
+        records = []
+        # popleft is atomic, so emit() can keep appending meanwhile
+        while buffer:
+            records.append(buffer.popleft())
+        if self._dropped:
+            dropped, self._dropped = self._dropped, 0
+            records.append(("dropped", None, dropped))
+        if not records:
+            return
+        try:
+            self._file.write("".join(json.dumps(r, separators=(",", ":")) + "\n"
+                                     for r in records))
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"Could not write {len(records)} telemetry events: {e}", file=sys.stderr)
+
+    def _rotate(self):
+        self._file.close()
+        for n in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{n}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{n + 1}")
+        os.replace(self.path, self.path + ".1")
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        """Write out everything recorded so far and stop the writer."""
+        if self._thread.is_alive():
+            self._closed.set()
+            self._thread.join()
+
+# ================= READER =================
+def log_files(directory=TELEMETRY_DIR):
+    """Rotated logs oldest first, then the current one."""
+    path = os.path.join(directory, LOG_NAME)
+    rotated = sorted(glob.glob(path + ".*"), key=lambda p: -int(p.rsplit(".", 1)[1]))
+    return rotated + ([path] if os.path.exists(path) else [])
+
+def read_events(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+
+def aggregate(events):
+    """Totals over every run in the events, as a dict."""
+    spawns, hits = Counter(), Counter()
+    tiers = {}
+    runs = ended = diamonds = dropped = 0
+    distance = 0.0
+    frames = frame_ms = 0
+    frame_max = 0.0
+    for kind, tick, *fields in events:
+        if kind == "run":
+            runs += 1
+        elif kind == "spawn":
+            spawns[fields[0] or "gap"] += 1
+            spawns["diamond"] += bool(fields[1])
+        elif kind == "hit":
+            hits[fields[0]] += 1
+        elif kind == "diamond":
+            diamonds += 1
+        elif kind == "speed":
+            tiers.setdefault(fields[0], []).append(tick)
+        elif kind == "frames":
+            count, mean, worst = fields
+            frames += count
+            frame_ms += count * mean
+            frame_max = max(frame_max, worst)
+        elif kind == "end":
+            ended += 1
+            distance += fields[0]
+        elif kind == "dropped":
+            dropped += fields[0]
+    return {
+        "runs": runs,
+        "finished": ended,
+        "mean_distance": distance / ended if ended else 0.0,
+        "spawns": dict(spawns),
+        "hits": dict(hits),
+        "lives_lost": sum(hits.values()),
+        "diamonds": diamonds,
+        # speed -> mean tick it was first reached on
+        "tiers": {speed: sum(t) / len(t) for speed, t in sorted(tiers.items())},
+        "frames": frames,
+        "frame_mean_ms": frame_ms / frames if frames else 0.0,
+        "frame_max_ms": frame_max,
+        "dropped": dropped,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise Chaser telemetry logs.")
+    parser.add_argument("paths", nargs="*",
+                        help=f"log files (default: everything in {TELEMETRY_DIR}/)")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or log_files()
+    if not paths:
+        print("no telemetry logs found")
+        return 1
+    stats = aggregate(read_events(paths))
+    runs = max(stats["runs"], 1)
+
+    print(f"{stats['runs']} runs ({stats['finished']} finished), "
+          f"mean distance {stats['mean_distance']:.0f}")
+    print(f"lives lost {stats['lives_lost']} ({stats['lives_lost'] / runs:.2f} per run), "
+          f"diamonds {stats['diamonds']} ({stats['diamonds'] / runs:.1f} per run)")
+    for kind, count in sorted(stats["spawns"].items()):
+        hit = stats["hits"].get(kind)
+        rate = f"  hit {hit / count:.1%}" if hit else ""
+        print(f"  {kind:<8} spawned {count:>6}{rate}")
+    for speed, tick in stats["tiers"].items():
+        print(f"  speed {speed:>3} reached at tick {tick:.0f} on average")
+    if stats["frames"]:
+        print(f"frames {stats['frames']}: mean {stats['frame_mean_ms']:.2f} ms, "
+              f"worst {stats['frame_max_ms']:.2f} ms")
+    if stats["dropped"]:
+        print(f"{stats['dropped']} events dropped (writer fell behind)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""LRU cache of rendered text surfaces, and digit glyphs for counters.
+
+Titles and widget labels change far less often than frames are drawn, so
+each (font, text, color) is rasterised once and reused. Counters that keep
+climbing (distance, time) would miss the LRU on every new value, so
+draw_counter() blits the cached label followed by one cached glyph per
+digit, and no text is rasterised during play.
+"""
+from collections import OrderedDict
+
+import pygame
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+
+_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    """Drop-in for font.render(text, antialias, color) that reuses surfaces."""
+    return _cache.render(font, text, color, antialias)
+
+# ================= COUNTERS =================
+_glyphs = {}
+
+def _digit_glyphs(font, color, antialias):
+    key = (font, color, antialias)
+    glyphs = _glyphs.get(key)
+    if glyphs is None:
+        glyphs = {c: font.render(c, antialias, color) for c in "-0123456789"}
+        _glyphs[key] = glyphs
+    return glyphs
+
+def draw_counter(surface, font, label, value, color, topleft=None, topright=None,
+                 antialias=True):
+    """Blit label + str(value) at topleft (or right-aligned at topright).
+
+    Returns the rect drawn, like Surface.blit.
+    """
+    glyphs = _digit_glyphs(font, color, antialias)
+    parts = [_cache.render(font, label, color, antialias)]
+    parts += [glyphs[c] for c in str(int(value))]
+    width = sum(part.get_width() for part in parts)
+    if topleft is None:
+        topleft = (topright[0] - width, topright[1])
+    x, y = topleft
+    blits = []
+    for part in parts:
+        blits.append((part, (x, y)))
+        x += part.get_width()
+    surface.blits(blits, doreturn=False)
+    return pygame.Rect(topleft, (width, parts[0].get_height()))
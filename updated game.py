@@ -1,225 +1,218 @@
+import time
+STARTED = time.perf_counter()  # the startup report counts from here
+
+import argparse
 import pygame
 import sys
-import random
-import time
-import json
 import os
 
-pygame.init()
+from simulation import WIDTH, HEIGHT, GROUND_Y, FPS, World, FixedTimestep, step, lerp
+import replay
+from text_cache import render_text, draw_counter
+from dirty_rects import DirtyRects
+from sprite_cache import SpriteCache
+from assets import AssetManager, font_path, load_font
+from profiler import FrameProfiler, StartupTimer
+from scores import ScoreStore, Run
+from display import Display
+from parallax import Parallax
+from bot import AutoPlayer
+from input_latency import InputSampler, LatencyProbe
+from menu import Menu
+from level_stream import LevelStream
+from telemetry import Telemetry
+from ghost import Ghost, TraceRecorder, trace_path, translucent
+
+startup = StartupTimer(STARTED)
+startup.mark("imports")
+
+# Only what the login screen needs: no audio, joystick or timer subsystems
+pygame.display.init()
+pygame.font.init()
 
 # ================= SETTINGS =================
-WIDTH, HEIGHT = 800, 800
-GROUND_Y = 650
-FPS = 60
-
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Chaser v5")
-
-clock = pygame.time.Clock()
-
-FONT_BIG = pygame.font.SysFont("consolas", 55, bold=True)
-FONT_MED = pygame.font.SysFont("consolas", 32)
-FONT_SMALL = pygame.font.SysFont("consolas", 22)
+def _size(text):
+    return tuple(int(v) for v in text.lower().split("x"))
+
+def parse_options(argv):
+    parser = argparse.ArgumentParser(description="Chaser")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="resolution of the play field relative to the game's "
+                             f"{WIDTH}x{HEIGHT}, e.g. 0.5 on slow machines")
+    parser.add_argument("--window", type=_size, default=(WIDTH, HEIGHT),
+                        help="initial window size as WxH (the window is resizable)")
+    parser.add_argument("--fullscreen", action="store_true")
+    parser.add_argument("--gpu", action="store_true",
+                        help="scale the window with SDL's GPU renderer")
+    parser.add_argument("--smooth", action="store_true",
+                        help="filtered instead of nearest-neighbour scaling")
+    parser.add_argument("--autoplay", action="store_true",
+                        help="the autoplayer jumps instead of the space bar")
+    parser.add_argument("--filter-events", action="store_true",
+                        help="only queue the event types the current screen reads")
+    parser.add_argument("--latency", action="store_true",
+                        help="measure jump keypress-to-present latency")
+    parser.add_argument("--attract", action="store_true",
+                        help="run the bot demo when the login screen sits idle")
+    parser.add_argument("--ghost", action="store_true",
+                        help="race a ghost of your best run (and record this one)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each startup step took")
+    return parser.parse_args(argv)
+
+# Only the real game reads the command line; importers get the defaults
+options = parse_options(sys.argv[1:] if __name__ == "__main__" else [])
+
+# Everything draws into WIN, a fixed-size canvas the display scales to the window
+display = Display((WIDTH, HEIGHT), options.render_scale, options.window,
+                  options.fullscreen, options.gpu, options.smooth, caption="Chaser v5")
+WIN = display.surface
+LOW_RES_SCALE = 0.5
+startup.mark("display")
+
+# Frames are paced by the sampler, which stamps input as it arrives
+sampler = InputSampler(FPS, options.filter_events)
+latency = LatencyProbe() if options.latency else None
+
+# The login cursor blinks on a timer event, so idle menus can sleep in between
+BLINK_EVENT = pygame.event.custom_type()
+BLINK_MS = 500
+
+# Menus have nothing to animate: they sleep until input arrives, waking
+# up every MENU_WAKE seconds for the sky colour and the attract timer.
+# Their sky only steps every MENU_SKY_STEP seconds, since each step is a
+# full repaint; wakes in between only repaint the widgets that changed.
+IDLE_SCREENS = ("login", "result")
+MENU_WAKE = 1.0
+MENU_SKY_STEP = 5 * MENU_WAKE
+
+# Event types each screen reads on top of input_latency.BASE_EVENTS
+SCREEN_EVENTS = {
+    "login": (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, BLINK_EVENT),
+    "playing": (),
+    "attract": (pygame.MOUSEBUTTONDOWN,),
+    "result": (pygame.MOUSEBUTTONDOWN,),
+}
+
+# Loaded from a file (assets/fonts, else pygame's bundled default) rather
+# than SysFont, which scans every installed font first
+FONT_FILE = font_path()
+FONT_BIG = load_font(55, bold=True, path=FONT_FILE)
+FONT_MED = load_font(32, path=FONT_FILE)
+FONT_SMALL = load_font(22, path=FONT_FILE)
+startup.mark("fonts")
 
 BLACK = (30, 30, 30)
 RED = (200, 50, 50)
 
-# ================= HIGH SCORE =================
-FILE = "highscore.json"
-
-def load_high():
-    if not os.path.exists(FILE):
-        with open(FILE, "w") as f:
-            json.dump({"distance": 0}, f)
-    with open(FILE, "r") as f:
-        return json.load(f)
-
-def save_high(distance):
-    with open(FILE, "w") as f:
-        json.dump({"distance": distance}, f)
-
-highscore = load_high()
-
-# ================= PLAYER =================
-class Player:
-    def __init__(self, gender="Male"):
-        self.x = 150
-        self.y = GROUND_Y
-        self.vel = 0
-        self.gravity = 1.1
-        self.jump_power = -20
-        self.on_ground = True
-        self.invincible = False
-        self.inv_time = 0
-        self.gender = gender
-        self.sprite_width = 50  # Fixed sprite width in pixels
-        
-        # Load gender-specific sprites
-        self.idle_sprite = None
-        self.jump_sprite = None
-        self._load_sprites()
+shapes = SpriteCache(scale=display.render_scale)
+
+# ================= ASSETS =================
+# Scores, telemetry, sprites and the parallax strips are loaded by finish_startup(),
+# after the first login frame is on screen
+assets = AssetManager()
+background = None
+scores = None
+telemetry = None
+
+# ================= ENTITY RENDERING =================
+# Entities are drawn between their previous and current tick positions,
+# alpha being how far the frame is into the next tick. Drawing returns the
+# screen rects touched so the dirty-rect presenter can track them.
+# The play field goes into display.world, whose pixels are render_scale
+# times the logical coordinates used by the simulation.
+def _scaled(x, y, w, h, k):
+    return pygame.Rect(round(x * k), round(y * k), round(w * k), round(h * k))
+
+def draw_player(player, sprites, alpha=1.0):
+    layer, k = display.world, display.render_scale
+    idle_sprite, jump_sprite = sprites
+    sprite = jump_sprite if not player.on_ground else idle_sprite
+    y = lerp(player.prev_y, player.y, alpha)
     
-    def _load_sprites(self):
-        """Load idle and jump sprites based on gender, scaled to fixed width."""
-        gender_map = {
-            "Male": "male",
-            "Female": "female",
-            "Other": "other"
-        }
-        prefix = gender_map.get(self.gender, "male")
-        
-        try:
-            idle_img = pygame.image.load(f"assets/player/{prefix}_idle.png").convert_alpha()
-            jump_img = pygame.image.load(f"assets/player/{prefix}_jump.png").convert_alpha()
-            
-            # Scale sprites to fixed width while maintaining aspect ratio
-            idle_scale = self.sprite_width / idle_img.get_width()
-            idle_h = int(idle_img.get_height() * idle_scale)
-            self.idle_sprite = pygame.transform.scale(idle_img, (self.sprite_width, idle_h))
-            
-            jump_scale = self.sprite_width / jump_img.get_width()
-            jump_h = int(jump_img.get_height() * jump_scale)
-            self.jump_sprite = pygame.transform.scale(jump_img, (self.sprite_width, jump_h))
-        except pygame.error:
-            # Fallback if sprites not found
-            self.idle_sprite = None
-            self.jump_sprite = None
-
-    def jump(self):
-        if self.on_ground:
-            self.vel = self.jump_power
-            self.on_ground = False
-
-    def update(self):
-        self.vel += self.gravity
-        self.y += self.vel
-
-        if self.y >= GROUND_Y:
-            self.y = GROUND_Y
-            self.vel = 0
-            self.on_ground = True
-
-        if self.invincible and time.time() - self.inv_time > 1:
-            self.invincible = False
-
-    def _get_display_rect(self):
-        """Calculate hitbox that matches rendered sprite exactly."""
-        sprite = self.jump_sprite if not self.on_ground else self.idle_sprite
-        
-        if sprite is not None:
-            sprite_w = sprite.get_width()
-            sprite_h = sprite.get_height()
-            
-            # Position: bottom aligned with ground (self.y), centered on self.x
-            screen_x = self.x - sprite_w // 2
-            screen_y = self.y - sprite_h
-            
-            # Clamp to screen bounds (prevents sprite going off-screen)
-            screen_x = max(0, min(screen_x, WIDTH - sprite_w))
-            screen_y = max(0, screen_y)
-            
-            return pygame.Rect(screen_x, screen_y, sprite_w, sprite_h)
-        else:
-            # Fallback hitbox for shape-based rendering
-            return pygame.Rect(self.x + 10, self.y - 70, 20, 70)
-
-    def draw(self):
-        sprite = self.jump_sprite if not self.on_ground else self.idle_sprite
-        
-        if sprite is not None:
-            rect = self._get_display_rect()
-            WIN.blit(sprite, (rect.x, rect.y))
-        else:
-            # Fallback to simple shapes
-            color = BLACK if not self.invincible else RED
-            # Head
-            pygame.draw.rect(WIN, color, (self.x + 10, self.y - 70, 20, 20))
-            # Body
-            pygame.draw.rect(WIN, color, (self.x + 15, self.y - 50, 10, 30))
-            # Legs
-            pygame.draw.rect(WIN, color, (self.x + 10, self.y - 20, 8, 20))
-            pygame.draw.rect(WIN, color, (self.x + 22, self.y - 20, 8, 20))
-
-    def rect(self):
-        return self._get_display_rect()
-
-# ================= OBSTACLE =================
-class Obstacle:
-    def __init__(self, speed, obstacle_type=None):
-        self.x = WIDTH
-        self.y = GROUND_Y
-        self.speed = speed
-        self.hit = False  # Track if spike has spawned diamonds
-        
-        # Randomly choose obstacle type if not specified
-        if obstacle_type is None:
-            rand = random.random()
-            if rand < 0.6:  # 60% box
-                obstacle_type = "box"
-            elif rand < 0.85:  # 25% spike
-                obstacle_type = "spike"
-            else:  # 15% tall
-                obstacle_type = "tall"
-        
-        self.type = obstacle_type
-        
-        # Set dimensions based on type
-        if self.type == "box":
-            self.width = 40
-            self.height = random.randint(40, 70)
-        elif self.type == "spike":
-            self.width = 25
-            self.height = 60
-        elif self.type == "tall":
-            self.width = 40
-            self.height = random.randint(80, 100)
-
-    def update(self):
-        self.x -= self.speed
-
-    def draw(self):
-        if self.type == "box":
-            pygame.draw.rect(WIN, BLACK,
-                             (self.x, self.y - self.height,
-                              self.width, self.height))
-        elif self.type == "spike":
-            # Draw spike as triangle pointing up
-            spike_tip_x = self.x + self.width // 2
-            spike_base_y = self.y - self.height
-            pygame.draw.polygon(WIN, BLACK, [
-                (self.x, self.y),
-                (self.x + self.width, self.y),
-                (spike_tip_x, spike_base_y)
-            ])
-        elif self.type == "tall":
-            pygame.draw.rect(WIN, BLACK,
-                             (self.x, self.y - self.height,
-                              self.width, self.height))
-
-    def rect(self):
-        return pygame.Rect(self.x, self.y - self.height,
-                           self.width, self.height)
-
-# ================= DIAMOND =================
-class Diamond:
-    def __init__(self, speed):
-        self.x = WIDTH
-        self.y = GROUND_Y - random.randint(120, 180)
-        self.speed = speed
-
-    def update(self):
-        self.x -= self.speed
-
-    def draw(self):
-        pygame.draw.polygon(WIN, (255, 215, 0), [
-            (self.x, self.y),
-            (self.x + 12, self.y - 12),
-            (self.x + 24, self.y),
-            (self.x + 12, self.y + 12)
-        ])
-
-    def rect(self):
-        return pygame.Rect(self.x, self.y - 12, 24, 24)
+    if sprite is not None:
+        rect = player.rect()
+        return layer.blit(sprite, (rect.x * k, (rect.y + y - player.y) * k))
+    else:
+        # Fallback to simple shapes
+        color = BLACK if not player.invincible else RED
+        x = player.x
+        # Head
+        pygame.draw.rect(layer, color, _scaled(x + 10, y - 70, 20, 20, k))
+        # Body
+        pygame.draw.rect(layer, color, _scaled(x + 15, y - 50, 10, 30, k))
+        # Legs
+        pygame.draw.rect(layer, color, _scaled(x + 10, y - 20, 8, 20, k))
+        pygame.draw.rect(layer, color, _scaled(x + 22, y - 20, 8, 20, k))
+        return _scaled(x + 10, y - 70, 20, 70, k)
+
+# Obstacles, diamonds and clouds come pre-rendered from the sprite cache
+def obstacle_blit(obs, alpha=1.0):
+    x = lerp(obs.prev_x, obs.x, alpha)
+    return shapes.blit_args(obs.type, x, obs.y, obs.width, obs.height)
+
+def diamond_blit(dia, alpha=1.0):
+    return shapes.blit_args("diamond", lerp(dia.prev_x, dia.x, alpha), dia.y)
+
+def cloud_blit(cloud, alpha=1.0):
+    x = lerp(cloud.prev_x, cloud.x, alpha)
+    return shapes.blit_args("cloud", x, cloud.y, cloud.width, cloud.height)
+
+def draw_world(world, sprites, alpha=1.0, lap=None, ghost=None):
+    """Render one frame of a run; returns the rects of everything that moves.
+
+    The caller fills display.world with the sky first. ghost, if given, is
+    drawn faded behind the player until its run ends.
+    """
+    layer, k = display.world, display.render_scale
+    drawn = background.draw(layer, lerp(world.prev_scroll, world.scroll, alpha))
+    pygame.draw.line(layer, BLACK, (0, GROUND_Y * k), (WIDTH * k, GROUND_Y * k),
+                     max(1, round(3 * k)))
+    live = world.entities.live
+
+    # Simulated clouds, if the world has any, still drift behind everything
+    drawn += layer.blits([cloud_blit(cloud, alpha) for cloud in live["cloud"]])
+
+    if ghost is not None and not ghost.finished and ghost_sprites[0] is not None:
+        drawn.append(draw_player(ghost.player, ghost_sprites, alpha))
+    drawn.append(draw_player(world.player, sprites, alpha))
+
+    drawn += layer.blits([obstacle_blit(obs, alpha) for obs in live["obstacle"]] +
+                         [diamond_blit(dia, alpha) for dia in live["diamond"]])
+
+    # A reduced-resolution layer is stretched over the whole canvas
+    if layer is not WIN:
+        display.present_world()
+        drawn = [WIN.get_rect()]
+    if lap:
+        lap("draw")
+
+    drawn.append(draw_counter(WIN, FONT_SMALL, "Time: ", world.time, BLACK, (20, 20)))
+    drawn.append(draw_counter(WIN, FONT_SMALL, "Distance: ", world.distance, BLACK, (20, 50)))
+    drawn.append(draw_counter(WIN, FONT_SMALL, "Lives: ", world.lives, BLACK,
+                              topright=(WIDTH - 20, 20)))
+    drawn.append(draw_counter(WIN, FONT_SMALL, "Diamonds: ", world.diamonds_collected, BLACK,
+                              topright=(WIDTH - 20, 50)))
+    if ghost is not None:
+        ghost_text = render_text(FONT_SMALL, "Ghost beaten!" if ghost.finished
+                                 else f"Ghost: {int(ghost.best)}", RED)
+        drawn.append(WIN.blit(ghost_text, (20, 80)))
+    if lap:
+        lap("hud")
+    return drawn
+
+# ================= PERF OVERLAY =================
+def draw_overlay(profiler, entities):
+    """FPS, frame-time percentiles and entity counts in the bottom-left."""
+    lines = profiler.overlay_lines(entities)
+    if latency is not None:
+        lines = lines + [latency.summary()]
+    y = HEIGHT - 10 - 24 * len(lines)
+    drawn = []
+    for line in lines:
+        drawn.append(WIN.blit(render_text(FONT_SMALL, line, RED), (10, y)))
+        y += 24
+    return drawn
 
 # ================= INPUT BOX =================
 class InputBox:
@@ -231,7 +224,6 @@ class InputBox:
         self.max_chars = max_chars
         self.numeric = numeric
         self.cursor_visible = True
-        self.cursor_time = 0
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -248,10 +240,18 @@ class InputBox:
                     if event.unicode.isalpha() or event.unicode == ' ':
                         self.text += event.unicode
 
-    def update(self):
-        self.cursor_time += 1
-        if self.cursor_time % 30 == 0:
-            self.cursor_visible = not self.cursor_visible
+    def blink(self):
+        """Called on every BLINK_EVENT."""
+        self.cursor_visible = not self.cursor_visible
+
+    def view_key(self):
+        """Everything that affects how the box looks."""
+        return (self.text, self.active, self.active and self.cursor_visible)
+
+    def area(self):
+        """Screen area covered by the box and its label."""
+        return pygame.Rect(self.rect.x, self.rect.y - 25,
+                           self.rect.width, self.rect.height + 25)
 
     def draw(self):
         # Draw border
@@ -259,11 +259,11 @@ class InputBox:
         pygame.draw.rect(WIN, color, self.rect, 2)
         
         # Draw label
-        label_surf = FONT_SMALL.render(self.label, True, BLACK)
+        label_surf = render_text(FONT_SMALL, self.label, BLACK)
         WIN.blit(label_surf, (self.rect.x, self.rect.y - 25))
         
         # Draw text
-        text_surf = FONT_SMALL.render(self.text, True, BLACK)
+        text_surf = render_text(FONT_SMALL, self.text, BLACK)
         WIN.blit(text_surf, (self.rect.x + 10, self.rect.centery - text_surf.get_height()//2))
         
         # Draw cursor if active
@@ -339,25 +339,42 @@ class Dropdown:
             visible_options = min(len(self.options), self.max_visible)
             for i in range(visible_options):
                 option_rect = self._get_option_rect(i)
-                if option_rect.collidepoint(pygame.mouse.get_pos()):
+                if option_rect.collidepoint(display.mouse_pos()):
                     self.hover_index = i
                     return
             self.hover_index = -1
         
         return False  # Event not handled by dropdown
 
+    def view_key(self):
+        """Everything that affects how the dropdown looks."""
+        return (self.selected, self.open, self.hover_index,
+                self.scroll_offset, self.opens_upward)
+
+    def area(self):
+        """Screen area covered by the box, its label and any open options."""
+        area = pygame.Rect(self.rect.x, self.rect.y - 25,
+                           self.rect.width, self.rect.height + 25)
+        if self.open:
+            visible_options = min(len(self.options), self.max_visible)
+            for i in range(visible_options):
+                area.union_ip(self._get_option_rect(i))
+            # Room for the scroll indicator below the last option
+            area.union_ip(self._get_option_rect(visible_options).inflate(0, 10))
+        return area
+
     def draw(self):
         # Draw main dropdown box
         box_color = RED if self.open else BLACK
         pygame.draw.rect(WIN, box_color, self.rect, 2)
         
         # Draw label above dropdown
-        label_surf = FONT_SMALL.render(self.label, True, BLACK)
+        label_surf = render_text(FONT_SMALL, self.label, BLACK)
         WIN.blit(label_surf, (self.rect.x, self.rect.y - 25))
         
         # Draw selected value or placeholder
         display_text = self.selected if self.selected else "Select Gender"
-        text_surf = FONT_SMALL.render(display_text, True, BLACK)
+        text_surf = render_text(FONT_SMALL, display_text, BLACK)
         WIN.blit(text_surf, (self.rect.x + 10, 
                             self.rect.centery - text_surf.get_height()//2))
         
@@ -398,15 +415,16 @@ class Dropdown:
                 pygame.draw.rect(WIN, BLACK, option_rect, 1)
                 
                 # Draw option text
-                option_text = FONT_SMALL.render(self.options[actual_index], True, BLACK)
+                option_text = render_text(FONT_SMALL, self.options[actual_index], BLACK)
                 WIN.blit(option_text, (option_rect.x + 10,
                                       option_rect.centery - option_text.get_height()//2))
             
             # Draw scroll indicator if there are more options than visible
             if len(self.options) > self.max_visible:
-                scroll_text = FONT_SMALL.render(
+                scroll_text = render_text(
+                    FONT_SMALL,
                     f"({self.scroll_offset + visible_options}/{len(self.options)})", 
-                    True, (100, 100, 100)
+                    (100, 100, 100)
                 )
                 last_option_rect = self._get_option_rect(visible_options - 1)
                 WIN.blit(scroll_text, (last_option_rect.x + 10, 
@@ -428,36 +446,39 @@ class Button:
             pygame.draw.rect(WIN, BLACK, self.rect, 2)
             color = BLACK
         
-        label = FONT_SMALL.render(self.text, True, color)
+        label = render_text(FONT_SMALL, self.text, color)
         WIN.blit(label,
                  (self.rect.centerx - label.get_width()//2,
                   self.rect.centery - label.get_height()//2))
 
+    def view_key(self):
+        return (self.text, self.selected and self.toggle)
+
+    def area(self):
+        return self.rect
+
     def clicked(self, pos):
         return self.rect.collidepoint(pos)
 
-# ================= CLOUD =================
-class Cloud:
-    def __init__(self, speed):
-        self.x = WIDTH + 50
-        self.y = random.randint(50, 250)
-        self.speed = speed
-        self.width = random.randint(60, 100)
-        self.height = random.randint(30, 50)
-
-    def update(self):
-        self.x -= self.speed * 0.3
+# ================= LABEL =================
+class Label:
+    """One centred line of text in a fixed strip; empty text draws nothing."""
+    def __init__(self, area, y, color):
+        self.rect = pygame.Rect(area)
+        self.y = y
+        self.color = color
+        self.text = ""
 
     def draw(self):
-        # Simple cloud shape using circles
-        pygame.draw.circle(WIN, (220, 220, 220), (self.x, self.y), self.height//2)
-        pygame.draw.circle(WIN, (220, 220, 220), (self.x + 20, self.y - 10), self.height//2 + 5)
-        pygame.draw.circle(WIN, (220, 220, 220), (self.x + 40, self.y), self.height//2)
-        pygame.draw.circle(WIN, (220, 220, 220), (self.x + 60, self.y - 8), self.height//2)
-        pygame.draw.rect(WIN, (220, 220, 220), (self.x, self.y - self.height//2, self.width, self.height//2 + 5))
+        if self.text:
+            surf = render_text(FONT_SMALL, self.text, self.color)
+            WIN.blit(surf, (WIDTH//2 - surf.get_width()//2, self.y))
+
+    def view_key(self):
+        return self.text
 
-    def off_screen(self):
-        return self.x < -100
+    def area(self):
+        return self.rect
 
 # ================= VARIABLES =================
 state = "login"
@@ -472,37 +493,75 @@ age_box = InputBox(WIDTH//2 - 150, 420, 300, 40, "Age:", max_chars=2, numeric=Tr
 gender_dropdown = Dropdown(WIDTH//2 - 150, 510, 300, 40, "Gender:", ["Male", "Female"])
 start_btn = Button("START GAME", WIDTH//2 - 110, 700, 220, 60)
 
-player = Player("Male")  # Default, will be replaced when user selects gender
-lives = 3
-distance = 0
-diamonds_collected = 0
-speed = 5
-obstacles = []
-diamonds = []
-clouds = []
-last_spawn = 0
-last_cloud_spawn = 0
-start_time = 0
+player_sprites = None  # set up by reset() or start_attract()
+world = None
+timestep = FixedTimestep()
+recorder = None
+pending_inputs = set()  # Carried over until a frame actually runs a tick
+autopilot = AutoPlayer() if options.autoplay else None
+
+# Attract mode (--attract): the autoplayer runs a demo after the login
+# screen sits idle. Off by default, so an idle login screen stays asleep.
+ATTRACT_AFTER = 20  # seconds
+last_input = time.time()
+demo_bot = AutoPlayer()
 
 play_btn = Button("Play Again", WIDTH//2 - 240, 500)
 exit_btn = Button("Exit", WIDTH//2 + 20, 500)
 
+dirty = DirtyRects()
+profiler = FrameProfiler()
+error_label = Label((0, 690, WIDTH, 40), 700, RED)
+
+def draw_login_titles():
+    title1 = render_text(FONT_MED, "Welcome to the Game", BLACK)
+    title2 = render_text(FONT_BIG, "CHASER", BLACK)
+
+    WIN.blit(title1, (WIDTH//2 - title1.get_width()//2, 80))
+    WIN.blit(title2, (WIDTH//2 - title2.get_width()//2, 140))
+
+def draw_result_text():
+    text = render_text(FONT_BIG, "GAME OVER", BLACK)
+    WIN.blit(text, (WIDTH//2 - text.get_width()//2, 200))
+
+    stats = render_text(
+        FONT_MED,
+        f"Distance: {int(world.distance)}   Diamonds: {world.diamonds_collected}",
+        BLACK)
+    WIN.blit(stats, (WIDTH//2 - stats.get_width()//2, 300))
+
+    if new_best or best_run is not None:
+        best = render_text(
+            FONT_SMALL,
+            "New personal best!" if new_best else f"Your best: {int(best_run.distance)}",
+            RED if new_best else BLACK)
+        WIN.blit(best, (WIDTH//2 - best.get_width()//2, 370))
+
+login_menu = Menu(WIN, {"username": username_box, "age": age_box,
+                        "gender": gender_dropdown, "start": start_btn,
+                        "error": error_label}, draw_login_titles)
+result_menu = Menu(WIN, {"play": play_btn, "exit": exit_btn}, draw_result_text)
+screen = None  # the state the event filter and blink timer are set up for
+
+def new_world(gender, log=None):
+    """A fresh run whose level schedule is generated on a worker thread."""
+    if world is not None:
+        world.level.close()
+    return World(gender, assets.player_masks(gender), clouds=False, level=LevelStream,
+                 telemetry=log)
+
 def reset():
-    global player, lives, distance, diamonds_collected, speed
-    global obstacles, diamonds, clouds, last_spawn, last_cloud_spawn, start_time
+    global world, player_sprites, timestep, recorder
     global username_box, age_box, gender_dropdown, gender
 
-    player = Player(gender)
-    lives = 3
-    distance = 0
-    diamonds_collected = 0
-    speed = 5
-    obstacles = []
-    diamonds = []
-    clouds = []
-    last_spawn = 0
-    last_cloud_spawn = 0
-    start_time = time.time()
+    player_sprites = assets.player_sprites(gender, display.render_scale)
+    world = new_world(gender, telemetry)
+    timestep = FixedTimestep()
+    recorder = replay.ReplayRecorder(world)
+    pending_inputs.clear()
+    load_best()
+    if options.ghost:
+        start_ghost()
     
     # Reset login UI
     username_box.text = ""
@@ -512,9 +571,98 @@ def reset():
     gender_dropdown.selected = None
     gender_dropdown.open = False
 
+def set_render_scale(scale):
+    """Switch the play field resolution, e.g. to LOW_RES_SCALE."""
+    global player_sprites, ghost_sprites
+    display.set_render_scale(scale)
+    shapes.set_scale(scale)
+    background.set_scale(scale)
+    if world is not None:
+        player_sprites = assets.player_sprites(world.player.gender, scale)
+    if ghost is not None:
+        ghost_sprites = translucent(assets.player_sprites(ghost.gender, scale))
+    dirty.invalidate()
+
+def start_attract():
+    """Swap in a fresh demo run for the autoplayer; nothing of it is saved."""
+    global world, timestep, player_sprites
+    player_sprites = assets.player_sprites("Male", display.render_scale)
+    world = new_world("Male")
+    timestep = FixedTimestep()
+
+def finish_startup():
+    """Loads the login screen can do without; main() runs it after the first frame."""
+    global background, scores, telemetry
+    scores = ScoreStore()
+    scores.import_legacy()
+    startup.mark("scores")
+    telemetry = Telemetry()
+    startup.mark("telemetry")
+    background = Parallax(scale=display.render_scale)
+    startup.mark("parallax")
+    assets.preload_async()
+    startup.mark("asset thread")
+
+# ================= GHOST =================
+ghost = None          # the player's best run, raced with --ghost
+ghost_sprites = None
+tracer = None         # trace of the current run, kept if it beats the ghost
+
+def start_ghost():
+    global ghost, ghost_sprites, tracer
+    path = trace_path(username)
+    ghost = Ghost.open(path, assets.player_masks)
+    if ghost is not None:
+        ghost_sprites = translucent(assets.player_sprites(ghost.gender, display.render_scale))
+    tracer = TraceRecorder(path + ".part", world)
+
+def finish_ghost(keep=True):
+    """Stop racing; the new trace replaces the ghost if it went further."""
+    global ghost, tracer
+    best = None
+    if ghost is not None:
+        best = ghost.best
+        ghost.close()  # unmapped before its file may be replaced
+        ghost = None
+    if tracer is not None:
+        keep = keep and (best is None or world.distance > best)
+        tracer.finish(trace_path(username) if keep else None)
+        tracer = None
+
+# ================= REPLAYS =================
+REPLAY_DIR = "replays"
+
+def save_replay():
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}_{username or 'player'}.rpl"
+    replay.save(os.path.join(REPLAY_DIR, name), recorder.replay())
+
+best_run = None
+new_best = False
+
+def load_best():
+    """Read the player's best when a run starts, so game over never waits on disk.
+
+    The same player keeps the in-memory best, which already includes runs
+    the writer thread may not have committed yet.
+    """
+    global best_run
+    if best_run is None or best_run.username != username:
+        best_run = scores.personal_best(username)
+
+def record_run():
+    """Queue the finished run and work out the player's best for the result screen."""
+    global best_run, new_best
+    run = Run(username, int(age), gender, world.distance,
+              world.diamonds_collected, world.time, world.seed)
+    new_best = best_run is None or run.distance > best_run.distance
+    if new_best:
+        best_run = run
+    scores.record(run)
+
 # ================= DAY/NIGHT =================
-def get_sky():
-    t = (time.time() * 0.05) % 2
+def get_sky(seconds):
+    t = (seconds * 0.05) % 2
     if t < 1:
         return (135 + int(40*t),
                 206 - int(60*t),
@@ -525,18 +673,44 @@ def get_sky():
                 146 + int(60*t),
                 135 + int(100*t))
 
-# ================= MAIN LOOP =================
+# ================= FRAME =================
 running = True
-while running:
-    clock.tick(FPS)
-    WIN.fill(get_sky())
 
-    for event in pygame.event.get():
+def run_frame(dt, events):
+    """Handle events, advance and draw one frame, then present it."""
+    global running, state, username, age, gender, error_message, last_input, screen
+    global new_best
+    profiler.next_frame()
+    entered = state
+
+    for event in events:
+        event = display.translate(event)
         if event.type == pygame.QUIT:
             running = False
+        if display.handle_event(event):
+            dirty.invalidate()
+        if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+            last_input = time.time()
+
+        # Display and profiling hotkeys work on every screen
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F11:
+                display.toggle_fullscreen()
+                dirty.invalidate()
+            elif event.key == pygame.K_F6:
+                set_render_scale(1.0 if display.render_scale != 1 else LOW_RES_SCALE)
+            elif event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+            elif event.key == pygame.K_F4:
+                print(f"Frame timings written to {profiler.dump_csv()}")
+            elif event.key == pygame.K_F5:
+                profiler.profile_frames(300)
 
         # LOGIN
         if state == "login":
+            if event.type == BLINK_EVENT:
+                username_box.blink()
+                age_box.blink()
             username_box.handle_event(event)
             age_box.handle_event(event)
             
@@ -562,8 +736,15 @@ while running:
         # PLAYING
         elif state == "playing":
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    player.jump()
+                if event.key == pygame.K_SPACE and autopilot is None:
+                    pending_inputs.add("jump")
+                    if latency is not None:
+                        latency.press(getattr(event, "stamp", time.perf_counter()))
+
+        # ATTRACT: any key or click goes back to the login screen
+        elif state == "attract":
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                state = "login"
 
         # RESULT
         elif state == "result":
@@ -574,119 +755,115 @@ while running:
                 if exit_btn.clicked(event.pos):
                     running = False
 
-    # ================= DRAW LOGIN =================
-    if state == "login":
+    profiler.lap("events")
 
-        # Titles centered
-        title1 = FONT_MED.render("Welcome to the Game", True, BLACK)
-        title2 = FONT_BIG.render("CHASER", True, BLACK)
+    # Time spent on the previous screen (asleep, on a menu) is not play time
+    if state != entered:
+        dt = 0.0
 
-        WIN.blit(title1, (WIDTH//2 - title1.get_width()//2, 80))
-        WIN.blit(title2, (WIDTH//2 - title2.get_width()//2, 140))
+    if options.attract and state == "login" and time.time() - last_input > ATTRACT_AFTER:
+        start_attract()
+        state = "attract"
 
-        # Update and draw input boxes
-        username_box.update()
-        age_box.update()
-        username_box.draw()
-        age_box.draw()
-
-        # Draw gender dropdown
-        gender_dropdown.draw()
+    # A new screen or a sky colour step repaints everything
+    if state in ("playing", "attract"):
+        sky = get_sky(world.time)
+    else:
+        sky = get_sky(time.time() // MENU_SKY_STEP * MENU_SKY_STEP)
+    if dirty.changed("background", (state, sky)):
+        dirty.invalidate()
 
-        # Draw start button
-        start_btn.draw()
+    # ================= DRAW LOGIN =================
+    if state == "login":
 
-        # Draw error message if any
-        if error_message:
-            err = FONT_SMALL.render(error_message, True, RED)
-            WIN.blit(err, (WIDTH//2 - err.get_width()//2, 700))
+        # Only widgets whose look changed are repainted
+        error_label.text = error_message
+        login_menu.redraw(sky, dirty)
 
     # ================= PLAYING =================
     elif state == "playing":
 
-        pygame.draw.line(WIN, BLACK, (0, GROUND_Y), (WIDTH, GROUND_Y), 3)
-
-        # Spawn clouds
-        if time.time() - last_cloud_spawn > 3:
-            clouds.append(Cloud(speed))
-            last_cloud_spawn = time.time()
-
-        # Update and draw clouds (behind everything)
-        for cloud in clouds[:]:
-            cloud.update()
-            cloud.draw()
-            if cloud.off_screen():
-                clouds.remove(cloud)
-
-        player.update()
-        player.draw()
-
-        # Controlled spawn spacing
-        if time.time() - last_spawn > 1.5:
-            obstacles.append(Obstacle(speed))
-            if random.random() > 0.2:
-                diamonds.append(Diamond(speed))
-            last_spawn = time.time()
-
-        for obs in obstacles[:]:
-            obs.update()
-            obs.draw()
-            if obs.rect().colliderect(player.rect()):
-                if not player.invincible:
-                    lives -= 1
-                    player.invincible = True
-                    player.inv_time = time.time()
-                    
-                    # Spawn diamonds if hit a spike (only once per spike)
-                    if obs.type == "spike" and not obs.hit:
-                        obs.hit = True
-                        num_diamonds = random.randint(1, 3)
-                        for _ in range(num_diamonds):
-                            # Create diamond at spike position with slight offset
-                            diamond = Diamond(speed)
-                            diamond.x = obs.x + obs.width // 2
-                            diamond.y = obs.y - obs.height - 20
-                            diamonds.append(diamond)
-                    
-                    if lives <= 0:
-                        state = "result"
-
-        for dia in diamonds[:]:
-            dia.update()
-            dia.draw()
-            if dia.rect().colliderect(player.rect()):
-                diamonds_collected += 1
-                diamonds.remove(dia)
-
-        distance += speed * 0.05
-
-        if distance > 300:
-            speed = 10
-        elif distance > 150:
-            speed = 7
-
-        WIN.blit(FONT_SMALL.render(f"Time: {int(time.time()-start_time)}", True, BLACK), (20, 20))
-        WIN.blit(FONT_SMALL.render(f"Distance: {int(distance)}", True, BLACK), (20, 50))
-        lives_text = FONT_SMALL.render(f"Lives: {lives}", True, BLACK)
-        WIN.blit(lives_text, (WIDTH - lives_text.get_width() - 20, 20))
-        diamonds_text = FONT_SMALL.render(f"Diamonds: {diamonds_collected}", True, BLACK)
-        WIN.blit(diamonds_text, (WIDTH - diamonds_text.get_width() - 20, 50))
+        for _ in range(timestep.advance(dt)):
+            if autopilot is not None and autopilot.decide(world):
+                pending_inputs.add("jump")
+            recorder.record(pending_inputs)
+            step(world, pending_inputs, profiler.lap)
+            pending_inputs.clear()
+            if tracer is not None:
+                tracer.record()
+            if ghost is not None:
+                ghost.follow(world)
+            if latency is not None:
+                latency.simulated()
+        telemetry.frame(world.tick, dt)
+        display.world.fill(sky)
+        dirty.track("world", draw_world(world, player_sprites, timestep.alpha, profiler.lap,
+                                        ghost))
+        dirty.track("overlay", draw_overlay(profiler, world.entities) if profiler.overlay else [])
+
+        if world.game_over:
+            if autopilot is None:
+                save_replay()
+                record_run()
+                finish_ghost()
+            else:
+                # --autoplay runs are soak tests, not the player's: nothing is saved
+                new_best = False
+                finish_ghost(keep=False)
+            state = "result"
+
+    # ================= ATTRACT =================
+    elif state == "attract":
+
+        for _ in range(timestep.advance(dt)):
+            step(world, ("jump",) if demo_bot.decide(world) else ())
+        if world.game_over:
+            start_attract()
+        display.world.fill(sky)
+        drawn = draw_world(world, player_sprites, timestep.alpha)
+        banner = render_text(FONT_MED, "DEMO - press any key", RED)
+        drawn.append(WIN.blit(banner, (WIDTH//2 - banner.get_width()//2, 120)))
+        dirty.track("world", drawn)
 
     # ================= RESULT =================
     elif state == "result":
 
-        text = FONT_BIG.render("GAME OVER", True, BLACK)
-        WIN.blit(text, (WIDTH//2 - text.get_width()//2, 200))
+        result_menu.redraw(sky, dirty)
 
-        stats = FONT_MED.render(
-            f"Distance: {int(distance)}   Diamonds: {diamonds_collected}",
-            True, BLACK)
-        WIN.blit(stats, (WIDTH//2 - stats.get_width()//2, 300))
+    profiler.lap("draw")
+    dirty.present(display.present)
+    if latency is not None:
+        latency.presented()
+    profiler.lap("present")
 
-        play_btn.draw()
-        exit_btn.draw()
+    if state != screen:
+        screen = state
+        sampler.allow(SCREEN_EVENTS[state])
+        pygame.time.set_timer(BLINK_EVENT, BLINK_MS if state == "login" else 0)
 
-    pygame.display.update()
-
-pygame.quit()
-sys.exit()
\ No newline at end of file
+# ================= MAIN LOOP =================
+def main():
+    # Show the login screen before anything it does not need is loaded
+    run_frame(0.0, [])
+    startup.mark("first frame")
+    finish_startup()
+    if options.startup_report:
+        print(startup.report())
+
+    while running:
+        if state in IDLE_SCREENS:
+            dt = sampler.wait_idle(MENU_WAKE)
+        else:
+            dt = sampler.wait_frame()
+        run_frame(dt, sampler.collect())
+
+    if latency is not None:
+        print(latency.summary())
+    finish_ghost(keep=False)  # quit mid-run: the unfinished trace is dropped
+    scores.close()
+    telemetry.close()
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()